@@ -2,21 +2,58 @@
 Base adapter interface for all data source connectors.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Mapping
 import asyncio
 import logging
 
+import aiohttp
+import orjson
+from websockets.exceptions import ConnectionClosed
+
 logger = logging.getLogger(__name__)
 
+# Shared HTTP connection pool settings (REST polling by all adapters)
+REST_POOL_LIMIT = 100
+REST_DNS_CACHE_TTL = 300  # seconds
+REST_KEEPALIVE_TIMEOUT = 60  # seconds
+
+# Response bodies larger than this are decoded in a worker thread
+LARGE_JSON_BYTES = 64 * 1024
+
+# Queued storage writes are flushed in batches of up to this many records
+WRITE_BATCH_SIZE = 500
+# How long the flusher waits for more records to coalesce into a batch
+WRITE_FLUSH_INTERVAL = 0.05  # seconds
+
+# Live-update broadcasts waiting for WebSocket clients; new ones are dropped when full
+BROADCAST_QUEUE_SIZE = 1000
+
 class BaseAdapter(ABC):
     """Abstract base class for all data source adapters."""
     
+    # HTTP sessions are shared by every adapter sending the same default
+    # headers, and all sessions on an event loop share one connection pool
+    _shared_connectors: Dict[asyncio.AbstractEventLoop, aiohttp.TCPConnector] = {}
+    _shared_sessions: Dict[tuple, aiohttp.ClientSession] = {}
+    _session_refcounts: Dict[tuple, int] = {}
+    
     def __init__(self, name: str, config: Dict[str, Any]):
         self.name = name
         self.config = config
         self.is_running = False
         self._task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
+        # Seconds to wait between fetch cycles; subclasses may override
+        self.polling_interval = config.get('polling_interval', 0.1)
+        # Records awaiting a batched storage write, started on first use
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        # Records awaiting broadcast to WebSocket clients, started on first use
+        self._broadcast_queue: Optional[asyncio.Queue] = None
+        self._broadcast_task: Optional[asyncio.Task] = None
+        # Shared HTTP session, acquired in start() by adapters that make HTTP requests
+        self.session = None
+        self._session_key: Optional[tuple] = None
         
     @abstractmethod
     async def start(self) -> bool:
@@ -56,16 +93,14 @@ class BaseAdapter(ABC):
             while not self._stop_event.is_set():
                 try:
                     await self._fetch_data()
-                    # Add a small delay to prevent overwhelming the WebSocket
-                    await asyncio.sleep(0.1)
+                    # Sleep until the next poll, waking immediately on stop
+                    if await self._wait_for_stop(self.polling_interval):
+                        break
                 except Exception as e:
                     logger.error(f"Error in adapter {self.name}: {e}")
                     # Longer pause on error to prevent infinite loops
-                    await asyncio.sleep(5)
-                
-                # Check if we should stop
-                if self._stop_event.is_set():
-                    break
+                    if await self._wait_for_stop(5):
+                        break
                     
         except asyncio.CancelledError:
             logger.info(f"Adapter {self.name} was cancelled")
@@ -80,6 +115,159 @@ class BaseAdapter(ABC):
         """Internal method to fetch data from the source."""
         pass
     
+    async def _wait_for_stop(self, timeout: float) -> bool:
+        """Sleep for up to timeout seconds, returning True early if the adapter is stopped."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    async def _decode_json(self, body: bytes) -> Any:
+        """Decode a JSON body, moving large payloads off the event loop."""
+        if len(body) > LARGE_JSON_BYTES:
+            return await asyncio.get_running_loop().run_in_executor(None, orjson.loads, body)
+        return orjson.loads(body)
+    
+    def _session_headers(self) -> Mapping[str, str]:
+        """Default headers for this adapter's shared session."""
+        return {}
+    
+    def _session_timeout(self) -> Optional[aiohttp.ClientTimeout]:
+        """Timeout for this adapter's shared session, or None for the aiohttp default."""
+        return None
+    
+    def _acquire_session(self) -> aiohttp.ClientSession:
+        """Get the shared session for this adapter's headers, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        timeout = self._session_timeout()
+        key = (loop, frozenset(self._session_headers().items()), timeout)
+        
+        session = BaseAdapter._shared_sessions.get(key)
+        if session is None or session.closed:
+            connector = BaseAdapter._shared_connectors.get(loop)
+            if connector is None or connector.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=REST_POOL_LIMIT,
+                    use_dns_cache=True,
+                    ttl_dns_cache=REST_DNS_CACHE_TTL,
+                    keepalive_timeout=REST_KEEPALIVE_TIMEOUT
+                )
+                BaseAdapter._shared_connectors[loop] = connector
+            
+            session_kwargs = {"headers": dict(key[1]), "connector": connector, "connector_owner": False}
+            if timeout is not None:
+                session_kwargs["timeout"] = timeout
+            session = aiohttp.ClientSession(**session_kwargs)
+            BaseAdapter._shared_sessions[key] = session
+            BaseAdapter._session_refcounts[key] = 0
+        
+        BaseAdapter._session_refcounts[key] += 1
+        self._session_key = key
+        return session
+    
+    async def _release_session(self):
+        """Release this adapter's shared session, closing it when no adapter uses it."""
+        key = self._session_key
+        self.session = None
+        self._session_key = None
+        if key is None or key not in BaseAdapter._session_refcounts:
+            return
+        
+        BaseAdapter._session_refcounts[key] -= 1
+        if BaseAdapter._session_refcounts[key] > 0:
+            return
+        
+        del BaseAdapter._session_refcounts[key]
+        session = BaseAdapter._shared_sessions.pop(key)
+        await session.close()
+        
+        # Close the pool once the last session on this loop is gone
+        loop = key[0]
+        if not any(other[0] is loop for other in BaseAdapter._shared_sessions):
+            connector = BaseAdapter._shared_connectors.pop(loop, None)
+            if connector is not None:
+                await connector.close()
+    
+    def _queue_write(self, record: Dict[str, Any]):
+        """Queue a record for the next batched storage write."""
+        if self._write_queue is None:
+            self._write_queue = asyncio.Queue()
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        self._write_queue.put_nowait(record)
+    
+    def _store_batch(self, batch: List[Dict[str, Any]]):
+        """Persist a batch of queued records; adapters that queue writes override this."""
+        pass
+    
+    async def _flush_batch(self, batch: List[Dict[str, Any]]):
+        """Write a batch off the event loop, logging rather than raising on failure."""
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._store_batch, batch)
+        except Exception as e:
+            logger.error(f"Error storing batch of {len(batch)} records for {self.name}: {e}")
+    
+    async def _flush_loop(self):
+        """Drain the write queue, coalescing records that arrive close together, until a None sentinel."""
+        queue = self._write_queue
+        while True:
+            record = await queue.get()
+            if record is None:
+                return
+            batch = [record]
+            if queue.qsize() < WRITE_BATCH_SIZE - 1:
+                await asyncio.sleep(WRITE_FLUSH_INTERVAL)
+            while len(batch) < WRITE_BATCH_SIZE and not queue.empty():
+                record = queue.get_nowait()
+                if record is None:
+                    await self._flush_batch(batch)
+                    return
+                batch.append(record)
+            await self._flush_batch(batch)
+    
+    async def _stop_write_queue(self):
+        """Stop the flusher once every queued record has been written."""
+        if self._flush_task:
+            self._write_queue.put_nowait(None)
+            await self._flush_task
+            self._flush_task = None
+            self._write_queue = None
+    
+    def _queue_broadcast(self, record: Dict[str, Any]):
+        """Queue a record for broadcast so slow WebSocket clients never block ingest."""
+        if self._broadcast_queue is None:
+            self._broadcast_queue = asyncio.Queue(maxsize=BROADCAST_QUEUE_SIZE)
+            self._broadcast_task = asyncio.create_task(self._broadcast_loop())
+        try:
+            self._broadcast_queue.put_nowait(record)
+        except asyncio.QueueFull:
+            logger.warning(f"Broadcast queue full for {self.name}, dropping update")
+    
+    async def _broadcast(self, record: Dict[str, Any]):
+        """Send one record to WebSocket clients; adapters that queue broadcasts override this."""
+        pass
+    
+    async def _broadcast_loop(self):
+        """Send queued records to WebSocket clients one at a time."""
+        queue = self._broadcast_queue
+        while True:
+            record = await queue.get()
+            try:
+                await self._broadcast(record)
+            except Exception as e:
+                logger.error(f"Error broadcasting update for {self.name}: {e}")
+    
+    async def _stop_broadcasts(self):
+        """Stop the broadcaster, dropping any updates not yet sent."""
+        if self._broadcast_task:
+            self._broadcast_task.cancel()
+            try:
+                await self._broadcast_task
+            except asyncio.CancelledError:
+                pass
+            self._broadcast_task = None
+            self._broadcast_queue = None
+    
     async def _start_background_task(self):
         """Start the background data fetching task."""
         if self._task is None or self._task.done():
@@ -95,6 +283,8 @@ class BaseAdapter(ABC):
             except asyncio.CancelledError:
                 pass
             self._task = None
+        await self._stop_write_queue()
+        await self._stop_broadcasts()
 
 
 class WebSocketAdapter(BaseAdapter):
@@ -139,16 +329,18 @@ class WebSocketAdapter(BaseAdapter):
             except asyncio.TimeoutError:
                 # Timeout is normal, just continue
                 pass
-            except Exception as e:
-                if "ConnectionClosed" in str(type(e)) or "ConnectionClosed" in str(e):
-                    logger.warning(f"WebSocket connection closed for {self.name}")
-                    self._stop_event.set()
-                elif "cannot call recv while another coroutine is already running" in str(e):
-                    # This is the specific error we're seeing - stop the adapter
+            except ConnectionClosed:
+                logger.warning(f"WebSocket connection closed for {self.name}")
+                self._stop_event.set()
+            except RuntimeError as e:
+                if e.args and "cannot call recv while another" in str(e.args[0]):
+                    # Concurrent recv() on the same socket - stop the adapter
                     logger.error(f"WebSocket concurrency error in {self.name}, stopping adapter")
                     self._stop_event.set()
                 else:
                     logger.error(f"Error processing WebSocket message: {e}")
+            except Exception as e:
+                logger.error(f"Error processing WebSocket message: {e}")
     
     @abstractmethod
     async def _process_websocket_message(self, message: str) -> Optional[Dict[str, Any]]:
@@ -168,13 +360,11 @@ class RESTAdapter(BaseAdapter):
         super().__init__(name, config)
         self.base_url = config.get('base_url')
         self.api_key = config.get('api_key')
-        self.session = None
         
     async def start(self) -> bool:
         """Start REST adapter."""
         try:
-            import aiohttp
-            self.session = aiohttp.ClientSession()
+            self.session = self._acquire_session()
             await self._start_background_task()
             return True
         except Exception as e:
@@ -185,8 +375,7 @@ class RESTAdapter(BaseAdapter):
         """Stop REST adapter."""
         try:
             await self._stop_background_task()
-            if self.session:
-                await self.session.close()
+            await self._release_session()
             return True
         except Exception as e:
             logger.error(f"Error stopping REST adapter {self.name}: {e}")
@@ -212,7 +401,7 @@ class RESTAdapter(BaseAdapter):
         try:
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return await self._decode_json(await response.read())
                 else:
                     logger.warning(f"HTTP {response.status} from {url}")
                     return None
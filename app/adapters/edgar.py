@@ -4,21 +4,53 @@ Collects 10-K, 10-Q, 8-K filings from SEC EDGAR database.
 """
 import asyncio
 import aiohttp
+import ijson
 import logging
+import time
+from collections import deque
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Any, Mapping, Optional
 from urllib.parse import urljoin
 import json
 import re
 
-from .base import BaseAdapter
+from .base import RESTAdapter
 from ..core.normalizer import normalizer
 
 logger = logging.getLogger(__name__)
 
-class EdgarAdapter(BaseAdapter):
+# SEC fair-access policy allows at most 10 requests per second
+SEC_MAX_REQUESTS_PER_SECOND = 10
+# Maximum number of company filing requests in flight at once
+SEC_MAX_CONCURRENT_REQUESTS = 4
+# How long the ticker to CIK map is reused before revalidating (seconds)
+CIK_CACHE_TTL = 24 * 60 * 60
+
+_UTC = timezone.utc
+
+class EdgarAdapter(RESTAdapter):
     """SEC EDGAR filings adapter."""
     
+    # Shared, immutable request settings for every EDGAR adapter instance
+    TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+    HEADERS = MappingProxyType({
+        'User-Agent': 'NeuroTradeAI Data Scraper (contact@example.com)',
+        'Accept': 'application/json',
+        'Host': 'data.sec.gov'
+    })
+    TIMEOUT = aiohttp.ClientTimeout(total=30)
+    # Stable CIKs for the default watchlist, usable before the ticker map loads
+    KNOWN_CIKS = MappingProxyType({
+        'AAPL': '0000320193',
+        'MSFT': '0000789019',
+        'GOOGL': '0001652044',
+        'AMZN': '0001018724',
+        'TSLA': '0001318605'
+    })
+    # facts.dei entries read from companyfacts; all other facts are skipped
+    DEI_FIELDS = frozenset(('EntityRegistrantName', '10-K', '10-Q', '8-K'))
+    
     def __init__(self, name: str, config: Dict[str, Any]):
         super().__init__(name, config)
         self.storage = config.get('storage')
@@ -26,25 +58,40 @@ class EdgarAdapter(BaseAdapter):
         self.base_url = "https://www.sec.gov/Archives/edgar"
         self.api_url = "https://data.sec.gov/api/xbrl/companyfacts"
         self.watchlist = config.get('watchlist', ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA"])
+        self._watchlist_set = frozenset(symbol.upper() for symbol in self.watchlist)
+        self.polling_interval = config.get('polling_interval', 21600)  # 6 hours default
         self.session = None
         self.last_check = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._dispatch_lock: Optional[asyncio.Lock] = None
+        self._dispatch_times = deque(maxlen=SEC_MAX_REQUESTS_PER_SECOND)
+        self._cik_cache: Optional[Dict[str, str]] = None
+        self._cik_etag: Optional[str] = None
+        self._cik_fetched_at: float = 0
         
+    def _session_headers(self) -> Mapping[str, str]:
+        """SEC-required User-Agent and JSON headers."""
+        return self.HEADERS
+    
+    def _session_timeout(self) -> aiohttp.ClientTimeout:
+        """Timeout applied to every SEC request."""
+        return self.TIMEOUT
+    
     async def start(self) -> bool:
         """Start EDGAR adapter."""
         try:
             # EDGAR doesn't require API key (public access)
             logger.info("Starting EDGAR adapter with public access")
             
-            # Create aiohttp session
-            self.session = aiohttp.ClientSession(
-                headers={
-                    'User-Agent': 'NeuroTradeAI Data Scraper (contact@example.com)',
-                    'Accept': 'application/json',
-                    'Host': 'data.sec.gov'
-                },
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
-            
+            # Use the shared REST session for the SEC headers; its pool keeps
+            # connections alive across a cycle and caches DNS lookups
+            self.session = self._acquire_session()
+
+            # Bound concurrent filing requests and pace dispatches
+            self._semaphore = asyncio.Semaphore(SEC_MAX_CONCURRENT_REQUESTS)
+            self._dispatch_lock = asyncio.Lock()
+            self._dispatch_times.clear()
+
             logger.info("EDGAR adapter initialized")
             
             # Start background task for filing collection
@@ -59,8 +106,7 @@ class EdgarAdapter(BaseAdapter):
     async def stop(self):
         """Stop EDGAR adapter."""
         try:
-            if self.session:
-                await self.session.close()
+            await self._release_session()
             logger.info("EDGAR adapter stopped")
         except Exception as e:
             logger.error(f"Error stopping EDGAR adapter: {e}")
@@ -68,57 +114,93 @@ class EdgarAdapter(BaseAdapter):
     async def _fetch_data(self):
         """Fetch EDGAR filings data."""
         try:
-            # Check for new filings every 6 hours
-            if self.last_check and (datetime.now(timezone.utc) - self.last_check).hours < 6:
-                await asyncio.sleep(3600)  # Wait 1 hour
-                return
-            
             logger.info("Checking for new EDGAR filings...")
+            now = datetime.now(_UTC)
             
-            # Get company CIK numbers for watchlist
-            cik_map = await self._get_cik_numbers()
-            
-            # Check for new filings for each company
-            for symbol in self.watchlist:
-                if symbol in cik_map:
-                    await self._check_company_filings(symbol, cik_map[symbol])
-                    await asyncio.sleep(1)  # Rate limiting
-            
-            self.last_check = datetime.now(timezone.utc)
+            # Refresh the CIK map while companies with well-known CIKs are checked
+            cik_task = asyncio.create_task(self._get_cik_numbers())
+            known = {
+                symbol: self.KNOWN_CIKS[symbol]
+                for symbol in self.watchlist
+                if symbol in self.KNOWN_CIKS
+            }
+            known_checks = asyncio.gather(*(
+                self._bounded_check_company_filings(symbol, cik, now)
+                for symbol, cik in known.items()
+            ), return_exceptions=True)
             
+            # Check the remaining companies once their CIKs are known
+            cik_map = await cik_task
+            tasks = [
+                self._bounded_check_company_filings(symbol, cik_map[symbol], now)
+                for symbol in self.watchlist
+                if symbol in cik_map and symbol not in known
+            ]
+            await asyncio.gather(known_checks, *tasks, return_exceptions=True)
+
+            self.last_check = now
+
         except Exception as e:
             logger.error(f"Error fetching EDGAR data: {e}")
-    
+
+    async def _bounded_check_company_filings(self, symbol: str, cik: str,
+                                             now: Optional[datetime] = None):
+        """Check company filings while holding a concurrency slot."""
+        async with self._semaphore:
+            await self._wait_for_dispatch_slot()
+            await self._check_company_filings(symbol, cik, now)
+
+    async def _wait_for_dispatch_slot(self):
+        """Wait until another request fits within the SEC requests-per-second limit."""
+        async with self._dispatch_lock:
+            if len(self._dispatch_times) == self._dispatch_times.maxlen:
+                wait_time = 1.0 - (time.monotonic() - self._dispatch_times[0])
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+            self._dispatch_times.append(time.monotonic())
+
     async def _get_cik_numbers(self) -> Dict[str, str]:
         """Get CIK numbers for watchlist symbols."""
+        # Ticker to CIK mappings change rarely, so reuse the cached map
+        if self._cik_cache is not None and time.monotonic() - self._cik_fetched_at < CIK_CACHE_TTL:
+            return self._cik_cache
+
         cik_map = {}
-        
+
         try:
             # Use SEC company tickers API
-            url = "https://www.sec.gov/files/company_tickers.json"
-            
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Map tickers to CIK numbers
-                    for entry in data.values():
-                        ticker = entry.get('ticker', '').upper()
-                        cik = str(entry.get('cik_str', ''))
-                        
-                        if ticker in self.watchlist and cik:
-                            cik_map[ticker] = cik.zfill(10)  # Pad CIK to 10 digits
-                            
+            url = self.TICKERS_URL
+            headers = {'If-None-Match': self._cik_etag} if self._cik_etag else {}
+
+            async with self.session.get(url, headers=headers) as response:
+                if response.status == 304 and self._cik_cache is not None:
+                    self._cik_fetched_at = time.monotonic()
+                    return self._cik_cache
+                elif response.status == 200:
+                    # Stream ticker entries one at a time instead of buffering
+                    # and parsing the whole multi-megabyte file
+                    async for _, entry in ijson.kvitems_async(response.content, ''):
+                        # SEC publishes tickers upper-cased already
+                        ticker = entry.get('ticker')
+                        cik = entry.get('cik_str')
+
+                        if ticker in self._watchlist_set and cik is not None:
+                            cik_map[ticker] = f"{int(cik):010d}"  # Pad CIK to 10 digits
+
+                    self._cik_cache = cik_map
+                    self._cik_etag = response.headers.get('ETag')
+                    self._cik_fetched_at = time.monotonic()
                     logger.info(f"Found CIK numbers for {len(cik_map)} symbols")
                 else:
                     logger.warning(f"Failed to get CIK numbers: {response.status}")
-                    
+
         except Exception as e:
             logger.error(f"Error getting CIK numbers: {e}")
-        
+
         return cik_map
     
-    async def _check_company_filings(self, symbol: str, cik: str):
+    async def _check_company_filings(self, symbol: str, cik: str,
+                                     now: Optional[datetime] = None):
         """Check for new filings for a specific company."""
         try:
             # Get recent filings from company facts API
@@ -126,74 +208,72 @@ class EdgarAdapter(BaseAdapter):
             
             async with self.session.get(url) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    dei_facts = await self._read_dei_facts(response.content)
                     
-                    # Extract recent filings
-                    recent_filings = self._extract_recent_filings(data, symbol)
+                    # Store recent filings as one batch
+                    batch = list(self._iter_recent_filings(dei_facts, symbol, now))
                     
-                    if recent_filings:
-                        logger.info(f"Found {len(recent_filings)} recent filings for {symbol}")
-                        
-                        # Store filings
-                        for filing in recent_filings:
-                            normalized = self.normalize(filing)
-                            if normalized:
-                                await self._handle_data(normalized)
+                    if batch:
+                        logger.info(f"Found {len(batch)} recent filings for {symbol}")
+                        await self._handle_filings(batch)
                 else:
                     logger.warning(f"Failed to get filings for {symbol}: {response.status}")
                     
         except Exception as e:
             logger.error(f"Error checking filings for {symbol}: {e}")
     
-    def _extract_recent_filings(self, data: Dict[str, Any], symbol: str) -> List[Dict[str, Any]]:
-        """Extract recent filings from company facts data."""
-        filings = []
+    async def _read_dei_facts(self, content) -> Dict[str, Any]:
+        """Stream companyfacts JSON, materializing only the facts.dei entries in DEI_FIELDS."""
+        dei_facts = {}
+        key = None
+        builder = None
         
-        try:
-            # Look for recent 10-K, 10-Q, 8-K filings
-            if 'facts' in data and 'dei' in data['facts']:
-                dei_facts = data['facts']['dei']
-                
-                # Get recent 10-K filings
-                if 'EntityRegistrantName' in dei_facts:
-                    entity_name = dei_facts['EntityRegistrantName']
-                    
-                    # Check for recent filings in the last 30 days
-                    cutoff_date = datetime.now(timezone.utc) - timedelta(days=30)
-                    
-                    # Look for recent 10-K, 10-Q, 8-K filings
-                    for filing_type in ['10-K', '10-Q', '8-K']:
-                        if filing_type in dei_facts:
-                            filing_data = dei_facts[filing_type]
-                            
-                            if 'units' in filing_data:
-                                for unit in filing_data['units'].values():
-                                    for filing in unit:
-                                        filing_date = filing.get('end', '')
-                                        
-                                        if filing_date:
-                                            try:
-                                                # Parse filing date
-                                                filing_dt = datetime.fromisoformat(filing_date.replace('Z', '+00:00'))
-                                                
-                                                if filing_dt >= cutoff_date:
-                                                    filings.append({
-                                                        'symbol': symbol,
-                                                        'filing_type': filing_type,
-                                                        'filing_date': filing_date,
-                                                        'entity_name': entity_name,
-                                                        'raw_data': filing,
-                                                        'source': 'edgar',
-                                                        'timestamp_utc': datetime.now(timezone.utc).isoformat()
-                                                    })
-                                            except Exception as e:
-                                                logger.debug(f"Error parsing filing date: {e}")
-                                                continue
-                                        
-        except Exception as e:
-            logger.error(f"Error extracting filings: {e}")
+        async for prefix, event, value in ijson.parse_async(content, use_float=True):
+            if prefix == 'facts.dei' and event in ('map_key', 'end_map'):
+                if builder is not None:
+                    dei_facts[key] = builder.value
+                    builder = None
+                if event == 'end_map':
+                    # Everything after facts.dei (e.g. us-gaap) is irrelevant
+                    break
+                key = value
+                if key in self.DEI_FIELDS:
+                    builder = ijson.ObjectBuilder()
+            elif builder is not None:
+                builder.event(event, value)
         
-        return filings
+        return dei_facts
+    
+    def _iter_recent_filings(self, dei_facts: Dict[str, Any], symbol: str,
+                             now: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Yield recent 10-K, 10-Q and 8-K filings from company facts.dei data, normalized."""
+        if not dei_facts or 'EntityRegistrantName' not in dei_facts:
+            return
+        entity_name = dei_facts['EntityRegistrantName']
+        
+        # Check for recent filings in the last 30 days; ISO dates
+        # compare correctly as strings, so no per-filing parsing
+        if now is None:
+            now = datetime.now(_UTC)
+        cutoff_iso = (now - timedelta(days=30)).strftime('%Y-%m-%d')
+        now_iso = now.isoformat()
+        build_filing = normalizer.build_filing
+        
+        for filing_type in ('10-K', '10-Q', '8-K'):
+            filing_data = dei_facts.get(filing_type)
+            if not filing_data:
+                continue
+            for unit in filing_data.get('units', {}).values():
+                for filing in unit:
+                    filing_date = filing.get('end')
+                    if filing_date and filing_date[:10] >= cutoff_iso:
+                        # Build the canonical record directly from loop locals
+                        yield build_filing(symbol, filing_type, filing_date[:10], raw_xbrl={
+                            'entity_name': entity_name,
+                            'source': 'edgar',
+                            'timestamp_utc': now_iso,
+                            'fact': filing
+                        })
     
     def normalize(self, raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Normalize filing data to canonical schema."""
@@ -201,15 +281,23 @@ class EdgarAdapter(BaseAdapter):
     
     async def _handle_data(self, data: Dict[str, Any]):
         """Handle processed filing data."""
+        await self._handle_filings([data])
+    
+    async def _handle_filings(self, filings: List[Dict[str, Any]]):
+        """Store a batch of processed filings and broadcast each one."""
         try:
-            # Store filing data
-            self.storage.store_filings([data])
+            # Store all filings in a single storage call, off the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.storage.store_filings, filings)
             
             # Broadcast to WebSocket clients
             from app.api.websocket import broadcast_filing_update
-            await broadcast_filing_update(data['symbol'], data)
+            await asyncio.gather(*(
+                broadcast_filing_update(filing['symbol'], filing) for filing in filings
+            ))
             
-            logger.info(f"Processed filing: {data.get('filing_type', 'Unknown')} for {data.get('symbol', 'Unknown')}")
+            for filing in filings:
+                logger.info(f"Processed filing: {filing.get('filing_type', 'Unknown')} for {filing.get('symbol', 'Unknown')}")
             
         except Exception as e:
             logger.error(f"Error handling filing data: {e}")
@@ -221,8 +309,7 @@ class EdgarAdapter(BaseAdapter):
                 return False
                 
             # Test with a simple request
-            url = "https://www.sec.gov/files/company_tickers.json"
-            async with self.session.get(url) as response:
+            async with self.session.get(self.TICKERS_URL) as response:
                 return response.status == 200
                 
         except Exception as e:
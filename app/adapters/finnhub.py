@@ -3,14 +3,17 @@ Finnhub adapter for real-time market data and news.
 Supports both WebSocket and REST API endpoints.
 """
 import asyncio
-import aiohttp
 import websockets
-import json
+import orjson
+import ijson
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 import logging
+import sys
+import time
 
 from app.adapters.base import WebSocketAdapter, RESTAdapter
+from app.api.websocket import broadcast_ohlcv_update
 from app.core.normalizer import normalizer
 from app.core.storage import StorageManager
 from app.core.rate_limiter import with_rate_limit
@@ -27,9 +30,21 @@ class FinnhubAdapter(WebSocketAdapter):
         self.watchlist = config.get('watchlist', [])
         self.base_url = config.get('base_url', 'https://finnhub.io/api/v1')
         self.websocket_url = config.get('websocket_url')
-        self.session = None
         self.storage = StorageManager(DATA_PATH, DB_PATH)
         self.subscribed_symbols = set()
+        # Interned watchlist symbols, so every tick record shares one str per symbol
+        self._symbols = {symbol: sys.intern(symbol) for symbol in self.watchlist}
+        # Quote request URL and per-symbol params are constant, so build them once
+        self._quote_url = f"{self.base_url}/quote"
+        self._quote_params = {
+            symbol: {'symbol': symbol, 'token': self.api_key}
+            for symbol in self.watchlist
+        }
+        # Subscribe frames are fixed per symbol, so encode them once (as text frames)
+        self._subscribe_frames = [
+            (symbol, orjson.dumps({"type": "subscribe", "symbol": symbol}).decode())
+            for symbol in self.watchlist
+        ]
     
     async def start(self) -> bool:
         """Start Finnhub adapter."""
@@ -38,8 +53,8 @@ class FinnhubAdapter(WebSocketAdapter):
                 logger.error("No API key provided for Finnhub")
                 return False
             
-            # Start REST session for historical data
-            self.session = aiohttp.ClientSession()
+            # Use the shared REST session for polling and historical data
+            self.session = self._acquire_session()
             
             # For now, skip WebSocket to avoid concurrency issues
             # We'll use REST-only mode for initial implementation
@@ -60,9 +75,8 @@ class FinnhubAdapter(WebSocketAdapter):
             # Stop WebSocket
             await super().stop()
             
-            # Close REST session
-            if self.session:
-                await self.session.close()
+            # Release the shared REST session
+            await self._release_session()
             
             return True
             
@@ -76,13 +90,9 @@ class FinnhubAdapter(WebSocketAdapter):
             return
         
         try:
-            for symbol in self.watchlist:
+            for symbol, frame in self._subscribe_frames:
                 # Subscribe to quote updates
-                subscribe_msg = {
-                    "type": "subscribe",
-                    "symbol": symbol
-                }
-                await self.websocket.send(json.dumps(subscribe_msg))
+                await self.websocket.send(frame)
                 self.subscribed_symbols.add(symbol)
                 logger.info(f"Subscribed to {symbol}")
                 
@@ -92,19 +102,20 @@ class FinnhubAdapter(WebSocketAdapter):
     async def _process_websocket_message(self, message: str) -> Optional[Dict[str, Any]]:
         """Process incoming WebSocket message."""
         try:
-            data = json.loads(message)
+            data = orjson.loads(message)
+            message_type = data.get('type')
             
-            if data.get('type') == 'trade':
+            if message_type == 'trade':
                 # Process trade data
                 return self._process_trade_data(data)
-            elif data.get('type') == 'quote':
+            elif message_type == 'quote':
                 # Process quote data
                 return self._process_quote_data(data)
             else:
-                logger.debug(f"Unknown message type: {data.get('type')}")
+                logger.debug("Unknown message type: %s", message_type)
                 return None
                 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error(f"Invalid JSON in WebSocket message: {message}")
             return None
         except Exception as e:
@@ -112,121 +123,107 @@ class FinnhubAdapter(WebSocketAdapter):
             return None
     
     def _process_trade_data(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Process trade data from WebSocket."""
-        try:
-            symbol = data.get('s')
-            price = data.get('p')
-            volume = data.get('v')
-            timestamp = data.get('t')
-            
-            if not all([symbol, price, volume, timestamp]):
-                return None
-            
-            # Convert timestamp from milliseconds to seconds
-            timestamp_sec = timestamp / 1000
-            
-            # Create OHLCV record (using price as OHLC for tick data)
-            raw_data = {
-                'symbol': symbol,
-                'timestamp': timestamp_sec,
-                'open': price,
-                'high': price,
-                'low': price,
-                'close': price,
-                'volume': volume,
-                'interval': 'tick'
-            }
-            
-            return raw_data
-            
-        except Exception as e:
-            logger.error(f"Error processing trade data: {e}")
+        """Process trade data from WebSocket; errors propagate to _process_websocket_message."""
+        symbol = data.get('s')
+        price = data.get('p')
+        volume = data.get('v')
+        timestamp = data.get('t')
+        
+        # Short-circuit check instead of building a list for all()
+        if not (symbol and price and volume and timestamp):
             return None
+        
+        # Create OHLCV record (using price as OHLC for tick data),
+        # converting the timestamp from milliseconds to seconds
+        return {
+            'symbol': self._symbols.get(symbol, symbol),
+            'timestamp': timestamp / 1000,
+            'open': price,
+            'high': price,
+            'low': price,
+            'close': price,
+            'volume': volume,
+            'interval': 'tick'
+        }
     
     def _process_quote_data(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Process quote data from WebSocket."""
-        try:
-            symbol = data.get('s')
-            bid = data.get('b')
-            ask = data.get('a')
-            timestamp = data.get('t')
-            
-            if not all([symbol, bid, ask, timestamp]):
-                return None
-            
-            # Convert timestamp from milliseconds to seconds
-            timestamp_sec = timestamp / 1000
-            
-            # Create quote record
-            raw_data = {
-                'symbol': symbol,
-                'timestamp': timestamp_sec,
-                'bid': bid,
-                'ask': ask,
-                'interval': 'quote'
-            }
-            
-            return raw_data
-            
-        except Exception as e:
-            logger.error(f"Error processing quote data: {e}")
+        """Process quote data from WebSocket; errors propagate to _process_websocket_message."""
+        symbol = data.get('s')
+        bid = data.get('b')
+        ask = data.get('a')
+        timestamp = data.get('t')
+        
+        if not (symbol and bid and ask and timestamp):
             return None
+        
+        # Create quote record, converting the timestamp from milliseconds to seconds
+        return {
+            'symbol': self._symbols.get(symbol, symbol),
+            'timestamp': timestamp / 1000,
+            'bid': bid,
+            'ask': ask,
+            'interval': 'quote'
+        }
     
     async def _fetch_data(self):
         """Fetch data using REST API polling instead of WebSocket."""
         try:
-            # Poll for quote data for each symbol in watchlist
-            for symbol in self.watchlist[:5]:  # Limit to first 5 symbols to avoid rate limits
-                try:
-                    url = f"{self.base_url}/quote"
-                    params = {
-                        'symbol': symbol,
-                        'token': self.api_key
-                    }
-                    
-                    async with self.session.get(url, params=params) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            # Convert to our format
-                            if data.get('c'):  # Current price exists
-                                raw_data = {
-                                    'symbol': symbol,
-                                    'timestamp': int(datetime.now().timestamp()),
-                                    'open': data.get('o', data.get('c')),
-                                    'high': data.get('h', data.get('c')),
-                                    'low': data.get('l', data.get('c')),
-                                    'close': data.get('c'),
-                                    'volume': data.get('v', 0),
-                                    'interval': '1m'
-                                }
-                                
-                                normalized = self.normalize(raw_data)
-                                if normalized:
-                                    await self._handle_data(normalized)
-                                    
-                except Exception as e:
-                    logger.error(f"Error fetching data for {symbol}: {e}")
-                    
-                # Small delay between requests to respect rate limits
-                await asyncio.sleep(1)
+            # One timestamp per cycle for every quote
+            timestamp = int(time.time())
+            
+            # Poll the whole watchlist concurrently; the shared token bucket
+            # keeps requests within the configured Finnhub quota
+            await asyncio.gather(*(
+                with_rate_limit("finnhub", self._fetch_symbol_quote, symbol, timestamp)
+                for symbol in self.watchlist
+            ))
                 
         except Exception as e:
             logger.error(f"Error in REST polling: {e}")
-
-    async def _handle_data(self, data: Dict[str, Any]):
-        """Handle processed data."""
+    
+    async def _fetch_symbol_quote(self, symbol: str, timestamp: int):
+        """Fetch and process the latest quote for a single symbol."""
         try:
-            # Store data
-            self.storage.store_ohlcv([data])
-            
-            # Broadcast to WebSocket clients
-            from app.api.websocket import broadcast_ohlcv_update
-            await broadcast_ohlcv_update(data['symbol'], data)
-            
-            logger.info(f"Processed OHLCV: {data['symbol']} = ${data.get('close', 0):.2f}")
-            
+            async with self.session.get(self._quote_url, params=self._quote_params[symbol]) as response:
+                if response.status == 200:
+                    data = await self._decode_json(await response.read())
+                    # Convert to our format
+                    if data.get('c'):  # Current price exists
+                        raw_data = {
+                            'symbol': symbol,
+                            'timestamp': timestamp,
+                            'open': data.get('o', data.get('c')),
+                            'high': data.get('h', data.get('c')),
+                            'low': data.get('l', data.get('c')),
+                            'close': data.get('c'),
+                            'volume': data.get('v', 0),
+                            'interval': '1m'
+                        }
+                        
+                        normalized = self.normalize(raw_data)
+                        if normalized:
+                            await self._handle_data(normalized)
+                            
         except Exception as e:
-            logger.error(f"Error handling data: {e}")
+            logger.error(f"Error fetching data for {symbol}: {e}")
+
+    async def _handle_data(self, data: Dict[str, Any]):
+        """Handle processed data; callers already log failures."""
+        # Queue for the next batched write
+        self._queue_write(data)
+        
+        # Broadcast to WebSocket clients without waiting on them
+        self._queue_broadcast(data)
+        
+        logger.info("Processed OHLCV: %s = $%.2f", data['symbol'], data.get('close', 0))
+    
+    def _store_batch(self, batch: List[Dict[str, Any]]):
+        """Store a batch of queued OHLCV records."""
+        self.storage.store_ohlcv(batch)
+    
+    async def _broadcast(self, record: Dict[str, Any]):
+        """Broadcast a queued OHLCV record."""
+        await broadcast_ohlcv_update(record['symbol'], record)
     
     def normalize(self, raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Normalize raw data to canonical schema."""
@@ -273,7 +270,11 @@ class FinnhubAdapter(WebSocketAdapter):
             
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    # Stream the candle arrays instead of buffering the whole body
+                    data = {
+                        key: value
+                        async for key, value in ijson.kvitems_async(response.content, '', use_float=True)
+                    }
                     return self._process_historical_data(data, symbol, resolution)
                 else:
                     logger.warning(f"HTTP {response.status} from Finnhub historical API")
@@ -290,31 +291,18 @@ class FinnhubAdapter(WebSocketAdapter):
                 logger.warning(f"Finnhub API returned error: {data.get('s')}")
                 return []
             
-            timestamps = data.get('t', [])
-            opens = data.get('o', [])
-            highs = data.get('h', [])
-            lows = data.get('l', [])
-            closes = data.get('c', [])
-            volumes = data.get('v', [])
-            
-            bars = []
-            for i in range(len(timestamps)):
-                raw_data = {
-                    'symbol': symbol,
-                    'timestamp': timestamps[i],
-                    'open': opens[i],
-                    'high': highs[i],
-                    'low': lows[i],
-                    'close': closes[i],
-                    'volume': volumes[i],
-                    'interval': resolution
-                }
-                
-                normalized = self.normalize(raw_data)
-                if normalized:
-                    bars.append(normalized)
-            
-            return bars
+            # Normalize all bars at once from Finnhub's parallel arrays
+            return normalizer.normalize_ohlcv_batch(
+                symbol,
+                data.get('t', []),
+                data.get('o', []),
+                data.get('h', []),
+                data.get('l', []),
+                data.get('c', []),
+                data.get('v', []),
+                resolution,
+                "finnhub"
+            )
             
         except Exception as e:
             logger.error(f"Error processing historical data: {e}")
@@ -337,8 +325,9 @@ class FinnhubAdapter(WebSocketAdapter):
             
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    return self._process_news_data(data)
+                    # Stream articles one at a time instead of buffering the whole body
+                    items = ijson.items_async(response.content, 'item', use_float=True)
+                    return self._process_news_data([item async for item in items])
                 else:
                     logger.warning(f"HTTP {response.status} from Finnhub news API")
                     return []
@@ -4,12 +4,13 @@ Supports multiple sources including Finnhub, RSS feeds, and other news APIs.
 """
 import asyncio
 import aiohttp
-import json
+import ijson
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 import logging
 
 from app.adapters.base import RESTAdapter
+from app.api.websocket import broadcast_news_update
 from app.core.normalizer import normalizer
 from app.core.storage import StorageManager
 from app.core.rate_limiter import with_rate_limit
@@ -28,6 +29,14 @@ class NewsAdapter(RESTAdapter):
         self.storage = StorageManager(DATA_PATH, DB_PATH)
         self.last_fetch_time = None
         self.polling_interval = config.get('polling_interval', 300)  # 5 minutes default
+        # Market news params are constant; company news params change only with the date window
+        self._market_news_params = {
+            'category': 'general',
+            'token': self.api_key,
+            'minId': 0  # Get latest news
+        }
+        self._company_news_window: Optional[tuple] = None
+        self._company_news_params: Dict[str, Dict[str, Any]] = {}
     
     async def start(self) -> bool:
         """Start news adapter."""
@@ -36,8 +45,8 @@ class NewsAdapter(RESTAdapter):
                 logger.error("No API key provided for news adapter")
                 return False
             
-            # Start REST session
-            self.session = aiohttp.ClientSession()
+            # Use the shared REST session
+            self.session = self._acquire_session()
             
             # Start background task for news polling
             await self._start_background_task()
@@ -53,8 +62,7 @@ class NewsAdapter(RESTAdapter):
         """Stop news adapter."""
         try:
             await self._stop_background_task()
-            if self.session:
-                await self.session.close()
+            await self._release_session()
             return True
         except Exception as e:
             logger.error(f"Error stopping news adapter: {e}")
@@ -63,13 +71,20 @@ class NewsAdapter(RESTAdapter):
     async def _fetch_data(self):
         """Fetch news data from API."""
         try:
-            # Fetch general market news
-            await self._fetch_market_news()
-            
-            # Fetch company-specific news for watchlist
-            for symbol in self.watchlist[:10]:  # Limit to avoid rate limits
-                await self._fetch_company_news(symbol)
-                await asyncio.sleep(1)  # Rate limiting delay
+            # Date window is computed once per cycle and shared by every symbol
+            today = date.today()
+            from_date = (today - timedelta(days=7)).isoformat()
+            to_date = today.isoformat()
+            
+            # Fetch general market news and company-specific news for watchlist concurrently;
+            # the shared Finnhub token bucket paces requests instead of a fixed delay
+            await asyncio.gather(
+                with_rate_limit("finnhub", self._fetch_market_news),
+                *(
+                    with_rate_limit("finnhub", self._fetch_company_news, symbol, from_date, to_date)
+                    for symbol in self.watchlist[:10]  # Limit to avoid rate limits
+                )
+            )
                 
         except Exception as e:
             logger.error(f"Error fetching news data: {e}")
@@ -78,15 +93,10 @@ class NewsAdapter(RESTAdapter):
         """Fetch general market news."""
         try:
             url = f"{self.base_url}/news"
-            params = {
-                'category': 'general',
-                'token': self.api_key,
-                'minId': 0  # Get latest news
-            }
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(url, params=self._market_news_params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await self._decode_json(await response.read())
                     if isinstance(data, list):
                         for news_item in data[:20]:  # Limit to 20 items
                             normalized = self.normalize(news_item)
@@ -98,20 +108,15 @@ class NewsAdapter(RESTAdapter):
         except Exception as e:
             logger.error(f"Error fetching market news: {e}")
     
-    async def _fetch_company_news(self, symbol: str):
-        """Fetch company-specific news."""
+    async def _fetch_company_news(self, symbol: str, from_date: str, to_date: str):
+        """Fetch company-specific news published between two YYYY-MM-DD dates."""
         try:
             url = f"{self.base_url}/company-news"
-            params = {
-                'symbol': symbol,
-                'from': (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'),
-                'to': datetime.now().strftime('%Y-%m-%d'),
-                'token': self.api_key
-            }
+            params = self._get_company_news_params(symbol, from_date, to_date)
             
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await self._decode_json(await response.read())
                     if isinstance(data, list):
                         for news_item in data[:10]:  # Limit to 10 items per company
                             normalized = self.normalize(news_item)
@@ -123,6 +128,32 @@ class NewsAdapter(RESTAdapter):
         except Exception as e:
             logger.error(f"Error fetching company news for {symbol}: {e}")
     
+    def _get_company_news_params(self, symbol: str, from_date: str, to_date: str) -> Dict[str, Any]:
+        """Get cached company news params, rebuilding them when the date window moves."""
+        window = (from_date, to_date)
+        if window != self._company_news_window:
+            self._company_news_window = window
+            self._company_news_params = {}
+        
+        params = self._company_news_params.get(symbol)
+        if params is None:
+            params = {
+                'symbol': symbol,
+                'from': from_date,
+                'to': to_date,
+                'token': self.api_key
+            }
+            self._company_news_params[symbol] = params
+        return params
+    
+    def _store_batch(self, batch: List[Dict[str, Any]]):
+        """Store a batch of queued news records."""
+        self.storage.store_news(batch)
+    
+    async def _broadcast(self, record: Dict[str, Any]):
+        """Broadcast a queued news record."""
+        await broadcast_news_update(record)
+    
     def normalize(self, raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Normalize news data to canonical schema."""
         return normalizer.normalize_news(raw_data, "finnhub")
@@ -130,14 +161,13 @@ class NewsAdapter(RESTAdapter):
     async def _handle_data(self, data: Dict[str, Any]):
         """Handle processed news data."""
         try:
-            # Store news data
-            self.storage.store_news([data])
+            # Queue for the next batched write
+            self._queue_write(data)
             
-            # Broadcast to WebSocket clients
-            from app.api.websocket import broadcast_news_update
-            await broadcast_news_update(data)
+            # Broadcast to WebSocket clients without waiting on them
+            self._queue_broadcast(data)
             
-            logger.info(f"Processed news: {data.get('headline', 'Unknown')[:50]}...")
+            logger.info("Processed news: %.50s...", data.get('headline', 'Unknown'))
             
         except Exception as e:
             logger.error(f"Error handling news data: {e}")
@@ -172,10 +202,11 @@ class NewsAdapter(RESTAdapter):
             if symbol:
                 # Fetch company-specific news
                 url = f"{self.base_url}/company-news"
+                today = date.today()
                 params = {
                     'symbol': symbol,
-                    'from': (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d'),
-                    'to': datetime.now().strftime('%Y-%m-%d'),
+                    'from': (today - timedelta(days=days_back)).isoformat(),
+                    'to': today.isoformat(),
                     'token': self.api_key
                 }
             else:
@@ -188,14 +219,13 @@ class NewsAdapter(RESTAdapter):
             
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    if isinstance(data, list):
-                        news_items = []
-                        for item in data:
-                            normalized = self.normalize(item)
-                            if normalized:
-                                news_items.append(normalized)
-                        return news_items
+                    # Stream and normalize articles one at a time instead of buffering the whole body
+                    news_items = []
+                    async for item in ijson.items_async(response.content, 'item', use_float=True):
+                        normalized = self.normalize(item)
+                        if normalized:
+                            news_items.append(normalized)
+                    return news_items
                 else:
                     logger.warning(f"HTTP {response.status} from historical news API")
                     return []
@@ -208,18 +238,7 @@ class NewsAdapter(RESTAdapter):
         """Calculate sentiment score for news text."""
         try:
             # Simple sentiment analysis using keyword matching
-            positive_words = ['beat', 'exceed', 'strong', 'growth', 'profit', 'gain', 'rise', 'up', 'positive']
-            negative_words = ['miss', 'fall', 'decline', 'loss', 'weak', 'down', 'negative', 'drop', 'crash']
-            
-            text_lower = text.lower()
-            positive_count = sum(1 for word in positive_words if word in text_lower)
-            negative_count = sum(1 for word in negative_words if word in text_lower)
-            
-            if positive_count + negative_count == 0:
-                return 0.0  # Neutral
-            
-            sentiment = (positive_count - negative_count) / (positive_count + negative_count)
-            return max(-1.0, min(1.0, sentiment))  # Clamp between -1 and 1
+            return normalizer.score_sentiment(text)
             
         except Exception as e:
             logger.error(f"Error calculating sentiment: {e}")
@@ -2,16 +2,26 @@
 Backtesting API routes.
 REST endpoints for running and managing backtests.
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
+from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Literal, Optional, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+import asyncio
 import logging
+import multiprocessing
+import os
+import sys
 import uuid
 
+import orjson
+
 from app.backtesting.data_loader import BacktestDataLoader
 from app.backtesting.vectorized_engine import VectorizedBacktestEngine
 from app.backtesting.event_driven_engine import EventDrivenBacktestEngine
+from app.backtesting.store import BacktestStore
 from app.core.storage import StorageManager
 from app.trading.strategies.base import BaseStrategy
 from app.trading.strategies.mean_reversion import MeanReversionStrategy
@@ -21,23 +31,87 @@ from app.trading.strategies.news_driven import NewsDrivenStrategy
 logger = logging.getLogger(__name__)
 
 # Create router
-router = APIRouter(prefix="/api/v1/backtest", tags=["backtesting"])
+router = APIRouter(prefix="/api/v1/backtest", tags=["backtesting"], default_response_class=ORJSONResponse)
+
+# orjson options for exported results (numpy values, naive datetimes as UTC)
+EXPORT_JSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+)
+
+# Completed results never change, so clients may cache them indefinitely
+RESULTS_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Backtest status and results are persisted in SQLite
+backtest_store: Optional[BacktestStore] = None
+
+# Statuses of backtests that have not finished yet
+ACTIVE_STATUSES = ("queued", "running")
+
+# Storage and data loader are shared across requests (and backtests within a worker)
+storage_manager: Optional[StorageManager] = None
+data_loader: Optional[BacktestDataLoader] = None
+
+# Available strategies and their tunable parameters (served as prebuilt JSON)
+AVAILABLE_STRATEGIES = [
+    {
+        "name": "mean_reversion",
+        "display_name": "Mean Reversion",
+        "description": "Trades on price reversals using RSI and Bollinger Bands",
+        "parameters": {
+            "rsi_oversold": {"type": "float", "default": 30, "min": 10, "max": 50},
+            "rsi_overbought": {"type": "float", "default": 70, "min": 50, "max": 90},
+            "bb_touch_threshold": {"type": "float", "default": 0.02, "min": 0.01, "max": 0.1}
+        }
+    },
+    {
+        "name": "momentum",
+        "display_name": "Momentum Breakout",
+        "description": "Trades on momentum breakouts using moving averages",
+        "parameters": {
+            "sma_period": {"type": "int", "default": 20, "min": 5, "max": 100},
+            "volume_threshold": {"type": "float", "default": 1.5, "min": 1.0, "max": 5.0}
+        }
+    },
+    {
+        "name": "news_driven",
+        "display_name": "News Driven",
+        "description": "Trades based on news sentiment and price movement",
+        "parameters": {
+            "sentiment_threshold": {"type": "float", "default": 0.7, "min": 0.5, "max": 1.0},
+            "price_change_threshold": {"type": "float", "default": 0.02, "min": 0.01, "max": 0.1}
+        }
+    }
+]
+AVAILABLE_STRATEGIES_JSON = orjson.dumps({"strategies": AVAILABLE_STRATEGIES})
+
+# Number of distinct strategy name/parameter sets kept constructed
+STRATEGY_CACHE_SIZE = 128
+
+# Worker processes running backtest engines, one per core by default
+backtest_pool: Optional[ProcessPoolExecutor] = None
+BACKTEST_WORKERS = os.cpu_count() or 1
 
-# Global backtest storage (in production, use database)
-backtest_results = {}
-running_backtests = {}
+# Bounded queue of submitted backtests, drained by a fixed number of job coroutines
+backtest_queue: Optional[asyncio.Queue] = None
+backtest_job_tasks: List[asyncio.Task] = []
+BACKTEST_QUEUE_SIZE = 256
+BACKTEST_CONCURRENCY = min(BACKTEST_WORKERS, 4)
 
 
 class BacktestRequest(BaseModel):
     """Backtest request model."""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     strategy_name: str = Field(..., description="Strategy name")
     symbols: List[str] = Field(..., description="List of symbols to trade")
-    start_date: str = Field(..., description="Start date (ISO format)")
-    end_date: str = Field(..., description="End date (ISO format)")
+    start_date: datetime = Field(..., description="Start date (ISO format)")
+    end_date: datetime = Field(..., description="End date (ISO format)")
     initial_balance: float = Field(100000.0, description="Initial balance")
     commission: float = Field(0.0, description="Commission per trade")
     slippage: float = Field(0.001, description="Slippage factor")
-    engine_type: str = Field("vectorized", description="Engine type: vectorized or event_driven")
+    engine_type: Literal["vectorized", "event_driven"] = Field(
+        "vectorized", description="Engine type: vectorized or event_driven"
+    )
     include_news: bool = Field(True, description="Include news data")
     include_filings: bool = Field(True, description="Include filings data")
     strategy_params: Optional[Dict[str, Any]] = Field(None, description="Strategy parameters")
@@ -45,6 +119,8 @@ class BacktestRequest(BaseModel):
 
 class BacktestResponse(BaseModel):
     """Backtest response model."""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     backtest_id: str
     status: str
     message: str
@@ -53,6 +129,8 @@ class BacktestResponse(BaseModel):
 
 class BacktestStatus(BaseModel):
     """Backtest status model."""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     backtest_id: str
     status: str
     progress: float
@@ -61,44 +139,125 @@ class BacktestStatus(BaseModel):
     completed_at: Optional[str] = None
 
 
+def utc_timestamp() -> str:
+    """Current UTC time as a fixed-width ISO-8601 string (sorts correctly as text)."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def build_strategy(strategy_name: str, params: Dict[str, Any]) -> BaseStrategy:
+    """Construct a strategy instance by name."""
+    if strategy_name == "mean_reversion":
+        return MeanReversionStrategy(params)
+    elif strategy_name == "momentum":
+        return MomentumStrategy(params)
+    elif strategy_name == "news_driven":
+        return NewsDrivenStrategy(params)
+    else:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+
+
+@lru_cache(maxsize=STRATEGY_CACHE_SIZE)
+def build_cached_strategy(strategy_name: str, params_key: Tuple[Tuple[str, Any], ...]) -> BaseStrategy:
+    """Construct a strategy once per name and parameter set (strategies keep no run state)."""
+    return build_strategy(strategy_name, dict(params_key))
+
+
 def get_strategy(strategy_name: str, params: Optional[Dict[str, Any]] = None) -> BaseStrategy:
     """Get strategy instance by name."""
     try:
-        if strategy_name == "mean_reversion":
-            return MeanReversionStrategy(params or {})
-        elif strategy_name == "momentum":
-            return MomentumStrategy(params or {})
-        elif strategy_name == "news_driven":
-            return NewsDrivenStrategy(params or {})
-        else:
-            raise ValueError(f"Unknown strategy: {strategy_name}")
+        params_key = tuple(sorted((params or {}).items()))
+        try:
+            return build_cached_strategy(strategy_name, params_key)
+        except TypeError:
+            # Unhashable parameter values cannot be cached
+            return build_strategy(strategy_name, dict(params_key))
     except Exception as e:
         logger.error(f"Error creating strategy {strategy_name}: {e}")
         raise HTTPException(status_code=400, detail=f"Error creating strategy: {e}")
 
 
+def get_backtest_store() -> BacktestStore:
+    """Get backtest store instance."""
+    global backtest_store
+    if backtest_store is None:
+        backtest_store = BacktestStore("data/backtests.db")
+        # Jobs do not survive a restart, so backtests still active on disk never finish
+        interrupted = backtest_store.fail_interrupted("Backtest interrupted by restart", utc_timestamp())
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted backtests as failed")
+    return backtest_store
+
+
+def get_backtest_pool() -> ProcessPoolExecutor:
+    """Get the backtest worker process pool."""
+    global backtest_pool
+    if backtest_pool is None:
+        # Spawn rather than fork, since the API process runs an event loop and threads
+        backtest_pool = ProcessPoolExecutor(
+            max_workers=BACKTEST_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return backtest_pool
+
+
+def get_backtest_queue() -> asyncio.Queue:
+    """Get the backtest job queue, starting its job coroutines on first use."""
+    global backtest_queue
+    if backtest_queue is None:
+        backtest_queue = asyncio.Queue(maxsize=BACKTEST_QUEUE_SIZE)
+        for _ in range(BACKTEST_CONCURRENCY):
+            backtest_job_tasks.append(asyncio.create_task(backtest_job_worker(backtest_queue)))
+    return backtest_queue
+
+
+def shutdown_backtest_pool():
+    """Stop the backtest job coroutines and shut down the worker processes."""
+    global backtest_pool, backtest_queue
+    for task in backtest_job_tasks:
+        task.cancel()
+    backtest_job_tasks.clear()
+    backtest_queue = None
+    
+    if backtest_pool is not None:
+        # cancel_futures, which drops jobs not yet started, needs Python 3.9
+        if sys.version_info >= (3, 9):
+            backtest_pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            backtest_pool.shutdown(wait=False)
+        backtest_pool = None
+
+
 def get_storage_manager() -> StorageManager:
     """Get storage manager instance."""
-    try:
-        return StorageManager("data", "data/trading.db")
-    except Exception as e:
-        logger.error(f"Error creating storage manager: {e}")
-        raise HTTPException(status_code=500, detail="Error initializing storage manager")
+    global storage_manager
+    if storage_manager is None:
+        try:
+            storage_manager = StorageManager("data", "data/trading.db")
+        except Exception as e:
+            logger.error(f"Error creating storage manager: {e}")
+            raise HTTPException(status_code=500, detail="Error initializing storage manager")
+    return storage_manager
+
+
+def get_data_loader() -> BacktestDataLoader:
+    """Get backtest data loader instance."""
+    global data_loader
+    if data_loader is None:
+        data_loader = BacktestDataLoader(get_storage_manager())
+    return data_loader
 
 
 @router.post("/run", response_model=BacktestResponse)
 async def run_backtest(
     request: BacktestRequest,
-    background_tasks: BackgroundTasks,
-    storage_manager: StorageManager = Depends(get_storage_manager)
+    store: BacktestStore = Depends(get_backtest_store)
 ):
     """
     Run a new backtest.
     
     Args:
         request: Backtest configuration
-        background_tasks: FastAPI background tasks
-        storage_manager: Storage manager instance
+        store: Backtest store
         
     Returns:
         Backtest response with ID and status
@@ -107,40 +266,36 @@ async def run_backtest(
         # Generate backtest ID
         backtest_id = str(uuid.uuid4())
         
-        # Parse dates
-        start_date = datetime.fromisoformat(request.start_date.replace('Z', '+00:00'))
-        end_date = datetime.fromisoformat(request.end_date.replace('Z', '+00:00'))
-        
-        # Validate dates
+        # Validate dates (parsed by the request model)
+        start_date = request.start_date
+        end_date = request.end_date
         if start_date >= end_date:
             raise HTTPException(status_code=400, detail="Start date must be before end date")
         
-        # Create strategy
-        strategy = get_strategy(request.strategy_name, request.strategy_params)
+        # Validate strategy (the worker process builds its own instance)
+        get_strategy(request.strategy_name, request.strategy_params)
         
-        # Initialize backtest status
-        backtest_status = BacktestStatus(
-            backtest_id=backtest_id,
+        # Reject rather than buffer without bound when the queue is full
+        queue = get_backtest_queue()
+        if queue.full():
+            raise HTTPException(status_code=503, detail="Backtest queue is full, try again later")
+        
+        # Store initial backtest status
+        store.create(
+            backtest_id,
             status="queued",
             progress=0.0,
             message="Backtest queued for execution",
-            created_at=datetime.now(timezone.utc).isoformat()
+            created_at=utc_timestamp()
         )
         
-        # Store status
-        backtest_results[backtest_id] = backtest_status
-        running_backtests[backtest_id] = True
-        
-        # Start background task
-        background_tasks.add_task(
-            execute_backtest,
-            backtest_id=backtest_id,
-            request=request,
-            start_date=start_date,
-            end_date=end_date,
-            strategy=strategy,
-            storage_manager=storage_manager
-        )
+        # Queue for execution
+        queue.put_nowait({
+            "backtest_id": backtest_id,
+            "request": request,
+            "start_date": start_date,
+            "end_date": end_date
+        })
         
         logger.info(f"Started backtest {backtest_id} for strategy {request.strategy_name}")
         
@@ -150,124 +305,254 @@ async def run_backtest(
             message="Backtest started successfully"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error starting backtest: {e}")
         raise HTTPException(status_code=500, detail=f"Error starting backtest: {e}")
 
 
+def run_backtest_sync(request: BacktestRequest, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    """Run a backtest engine to completion; executed inside a worker process."""
+    # Rebuild the strategy in the worker instead of pickling it across; storage is reused
+    strategy = get_strategy(request.strategy_name, request.strategy_params)
+    
+    if request.engine_type == "vectorized":
+        engine = VectorizedBacktestEngine(get_data_loader())
+    else:
+        engine = EventDrivenBacktestEngine(get_data_loader())
+    
+    return engine.run_backtest(
+        strategy=strategy,
+        symbols=request.symbols,
+        start_date=start_date,
+        end_date=end_date,
+        initial_balance=request.initial_balance,
+        commission=request.commission,
+        slippage=request.slippage,
+        include_news=request.include_news,
+        include_filings=request.include_filings
+    )
+
+
+def run_symbol_sync(
+    request: BacktestRequest,
+    symbol: str,
+    start_date: datetime,
+    end_date: datetime
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Run the vectorized engine for one symbol; executed inside a worker process."""
+    strategy = get_strategy(request.strategy_name, request.strategy_params)
+    engine = VectorizedBacktestEngine(get_data_loader())
+    
+    return symbol, engine.run_symbol(
+        strategy=strategy,
+        symbol=symbol,
+        start_date=start_date,
+        end_date=end_date,
+        initial_balance=request.initial_balance,
+        commission=request.commission,
+        slippage=request.slippage,
+        include_news=request.include_news,
+        include_filings=request.include_filings
+    )
+
+
+async def run_vectorized_backtest(
+    backtest_id: str,
+    request: BacktestRequest,
+    start_date: datetime,
+    end_date: datetime
+) -> Dict[str, Any]:
+    """Run a vectorized backtest with one worker task per symbol."""
+    store = get_backtest_store()
+    loop = asyncio.get_running_loop()
+    pool = get_backtest_pool()
+    tasks = [
+        loop.run_in_executor(pool, run_symbol_sync, request, symbol, start_date, end_date)
+        for symbol in request.symbols
+    ]
+    
+    symbol_results = {}
+    for completed, task in enumerate(asyncio.as_completed(tasks), start=1):
+        symbol, result = await task
+        if result is not None:
+            symbol_results[symbol] = result
+        store.update(
+            backtest_id,
+            progress=30.0 + 60.0 * completed / len(tasks),
+            message=f"Backtested {completed}/{len(tasks)} symbols"
+        )
+    
+    if not symbol_results:
+        raise ValueError("No data loaded for backtesting")
+    
+    # Keep the requested symbol order regardless of completion order
+    ordered_results = {symbol: symbol_results[symbol] for symbol in request.symbols if symbol in symbol_results}
+    engine = VectorizedBacktestEngine(get_data_loader())
+    return engine.combine_symbol_results(
+        ordered_results,
+        get_strategy(request.strategy_name, request.strategy_params),
+        request.symbols,
+        start_date,
+        end_date,
+        request.initial_balance,
+        request.commission,
+        request.slippage
+    )
+
+
 async def execute_backtest(
     backtest_id: str,
     request: BacktestRequest,
     start_date: datetime,
-    end_date: datetime,
-    strategy: BaseStrategy,
-    storage_manager: StorageManager
+    end_date: datetime
 ):
-    """Execute backtest in background."""
+    """Execute backtest in worker processes, keeping the event loop free."""
+    store = get_backtest_store()
     try:
         # Update status
-        backtest_results[backtest_id].status = "running"
-        backtest_results[backtest_id].progress = 10.0
-        backtest_results[backtest_id].message = "Loading data..."
-        
-        # Create data loader
-        data_loader = BacktestDataLoader(storage_manager)
+        store.update(backtest_id, status="running", progress=30.0, message="Running backtest...")
         
-        # Update progress
-        backtest_results[backtest_id].progress = 30.0
-        backtest_results[backtest_id].message = "Running backtest..."
-        
-        # Run backtest
+        # Run backtest; vectorized symbols are independent, event-driven ones share a portfolio
         if request.engine_type == "vectorized":
-            engine = VectorizedBacktestEngine(data_loader)
+            results = await run_vectorized_backtest(backtest_id, request, start_date, end_date)
         else:
-            engine = EventDrivenBacktestEngine(data_loader)
-        
-        results = engine.run_backtest(
-            strategy=strategy,
-            symbols=request.symbols,
-            start_date=start_date,
-            end_date=end_date,
-            initial_balance=request.initial_balance,
-            commission=request.commission,
-            slippage=request.slippage,
-            include_news=request.include_news,
-            include_filings=request.include_filings
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                get_backtest_pool(), run_backtest_sync, request, start_date, end_date
+            )
+        
+        # Store results and mark completed
+        store.update(
+            backtest_id,
+            results=results,
+            status="completed",
+            progress=100.0,
+            message="Backtest completed successfully",
+            completed_at=utc_timestamp()
         )
         
-        # Update status
-        backtest_results[backtest_id].status = "completed"
-        backtest_results[backtest_id].progress = 100.0
-        backtest_results[backtest_id].message = "Backtest completed successfully"
-        backtest_results[backtest_id].completed_at = datetime.now(timezone.utc).isoformat()
-        backtest_results[backtest_id].results = results
-        
-        # Remove from running
-        if backtest_id in running_backtests:
-            del running_backtests[backtest_id]
-        
         logger.info(f"Backtest {backtest_id} completed successfully")
         
     except Exception as e:
         logger.error(f"Error executing backtest {backtest_id}: {e}")
         
         # Update status with error
-        backtest_results[backtest_id].status = "failed"
-        backtest_results[backtest_id].message = f"Backtest failed: {str(e)}"
-        backtest_results[backtest_id].completed_at = datetime.now(timezone.utc).isoformat()
-        
-        # Remove from running
-        if backtest_id in running_backtests:
-            del running_backtests[backtest_id]
+        store.update(
+            backtest_id,
+            status="failed",
+            message=f"Backtest failed: {str(e)}",
+            completed_at=utc_timestamp()
+        )
+
+
+async def backtest_job_worker(queue: asyncio.Queue):
+    """Execute queued backtests one at a time."""
+    while True:
+        job = await queue.get()
+        try:
+            await execute_backtest(**job)
+        finally:
+            queue.task_done()
 
 
 @router.get("/status/{backtest_id}", response_model=BacktestStatus)
-async def get_backtest_status(backtest_id: str):
+async def get_backtest_status(backtest_id: str, store: BacktestStore = Depends(get_backtest_store)):
     """
     Get backtest status.
     
     Args:
         backtest_id: Backtest ID
+        store: Backtest store
         
     Returns:
         Backtest status
     """
-    if backtest_id not in backtest_results:
+    backtest = store.get(backtest_id)
+    if backtest is None:
         raise HTTPException(status_code=404, detail="Backtest not found")
     
-    return backtest_results[backtest_id]
+    return backtest
+
+
+def get_completed_results(store: BacktestStore, backtest_id: str) -> Dict[str, Any]:
+    """Load the results of a completed backtest, raising 404/400 otherwise."""
+    backtest = store.get(backtest_id)
+    if backtest is None:
+        raise HTTPException(status_code=404, detail="Backtest not found")
+    
+    results = store.get_results(backtest_id) if backtest["status"] == "completed" else None
+    if not results:
+        raise HTTPException(status_code=400, detail="Backtest not completed or no results")
+    
+    return results
+
+
+def get_results_etag(store: BacktestStore, backtest_id: str, variant: str) -> Optional[str]:
+    """Get the quoted ETag of one representation of a completed backtest's results."""
+    backtest = store.get(backtest_id)
+    if backtest is None or backtest["status"] != "completed":
+        return None
+    
+    digest = store.get_etag(backtest_id)
+    return f'"{digest}-{variant}"' if digest else None
+
+
+def is_not_modified(etag: Optional[str], if_none_match: Optional[str]) -> bool:
+    """Check whether an If-None-Match header already names the current ETag."""
+    if not etag or not if_none_match:
+        return False
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
 
 
 @router.get("/results/{backtest_id}")
-async def get_backtest_results(backtest_id: str):
+async def get_backtest_results(
+    backtest_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    store: BacktestStore = Depends(get_backtest_store)
+):
     """
     Get backtest results.
     
     Args:
         backtest_id: Backtest ID
+        response: Response whose caching headers are set
+        if_none_match: ETag the client already holds
+        store: Backtest store
         
     Returns:
-        Backtest results
+        Backtest results, or 304 if the client's copy is current
     """
-    if backtest_id not in backtest_results:
-        raise HTTPException(status_code=404, detail="Backtest not found")
+    etag = get_results_etag(store, backtest_id, "results")
+    if etag:
+        headers = {"ETag": etag, "Cache-Control": RESULTS_CACHE_CONTROL}
+        if is_not_modified(etag, if_none_match):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
     
-    backtest = backtest_results[backtest_id]
+    backtest = store.get(backtest_id)
+    if backtest is None:
+        raise HTTPException(status_code=404, detail="Backtest not found")
     
-    if backtest.status != "completed":
+    if backtest["status"] != "completed":
         raise HTTPException(status_code=400, detail="Backtest not completed")
     
-    if not backtest.results:
+    results = store.get_results(backtest_id)
+    if not results:
         raise HTTPException(status_code=500, detail="No results available")
     
-    return backtest.results
+    return results
 
 
 @router.get("/list")
 async def list_backtests(
     limit: int = 50,
     offset: int = 0,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    store: BacktestStore = Depends(get_backtest_store)
 ):
     """
     List backtests.
@@ -276,28 +561,18 @@ async def list_backtests(
         limit: Maximum number of backtests to return
         offset: Number of backtests to skip
         status: Filter by status
+        store: Backtest store
         
     Returns:
         List of backtests
     """
     try:
-        # Filter backtests
-        filtered_backtests = list(backtest_results.values())
-        
-        if status:
-            filtered_backtests = [bt for bt in filtered_backtests if bt.status == status]
-        
-        # Sort by creation date (newest first)
-        filtered_backtests.sort(key=lambda x: x.created_at, reverse=True)
-        
-        # Apply pagination
-        start = offset
-        end = offset + limit
-        paginated_backtests = filtered_backtests[start:end]
+        # Filter, sort (newest first) and paginate in SQLite using the indexes
+        paginated_backtests, total = store.list(limit=limit, offset=offset, status=status)
         
         return {
             "backtests": paginated_backtests,
-            "total": len(filtered_backtests),
+            "total": total,
             "limit": limit,
             "offset": offset
         }
@@ -308,25 +583,27 @@ async def list_backtests(
 
 
 @router.delete("/{backtest_id}")
-async def delete_backtest(backtest_id: str):
+async def delete_backtest(backtest_id: str, store: BacktestStore = Depends(get_backtest_store)):
     """
     Delete a backtest.
     
     Args:
         backtest_id: Backtest ID
+        store: Backtest store
         
     Returns:
         Success message
     """
-    if backtest_id not in backtest_results:
+    backtest = store.get(backtest_id)
+    if backtest is None:
         raise HTTPException(status_code=404, detail="Backtest not found")
     
     # Check if running
-    if backtest_id in running_backtests:
+    if backtest["status"] in ACTIVE_STATUSES:
         raise HTTPException(status_code=400, detail="Cannot delete running backtest")
     
     # Delete backtest
-    del backtest_results[backtest_id]
+    store.delete(backtest_id)
     
     logger.info(f"Deleted backtest {backtest_id}")
     
@@ -341,75 +618,49 @@ async def get_available_strategies():
     Returns:
         List of available strategies
     """
-    strategies = [
-        {
-            "name": "mean_reversion",
-            "display_name": "Mean Reversion",
-            "description": "Trades on price reversals using RSI and Bollinger Bands",
-            "parameters": {
-                "rsi_oversold": {"type": "float", "default": 30, "min": 10, "max": 50},
-                "rsi_overbought": {"type": "float", "default": 70, "min": 50, "max": 90},
-                "bb_touch_threshold": {"type": "float", "default": 0.02, "min": 0.01, "max": 0.1}
-            }
-        },
-        {
-            "name": "momentum",
-            "display_name": "Momentum Breakout",
-            "description": "Trades on momentum breakouts using moving averages",
-            "parameters": {
-                "sma_period": {"type": "int", "default": 20, "min": 5, "max": 100},
-                "volume_threshold": {"type": "float", "default": 1.5, "min": 1.0, "max": 5.0}
-            }
-        },
-        {
-            "name": "news_driven",
-            "display_name": "News Driven",
-            "description": "Trades based on news sentiment and price movement",
-            "parameters": {
-                "sentiment_threshold": {"type": "float", "default": 0.7, "min": 0.5, "max": 1.0},
-                "price_change_threshold": {"type": "float", "default": 0.02, "min": 0.01, "max": 0.1}
-            }
-        }
-    ]
-    
-    return {"strategies": strategies}
+    return Response(content=AVAILABLE_STRATEGIES_JSON, media_type="application/json")
 
 
 @router.get("/metrics/{backtest_id}")
-async def get_backtest_metrics(backtest_id: str):
+async def get_backtest_metrics(
+    backtest_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    store: BacktestStore = Depends(get_backtest_store)
+):
     """
     Get backtest performance metrics.
     
     Args:
         backtest_id: Backtest ID
+        response: Response whose caching headers are set
+        if_none_match: ETag the client already holds
+        store: Backtest store
         
     Returns:
-        Performance metrics
+        Performance metrics, or 304 if the client's copy is current
     """
-    if backtest_id not in backtest_results:
-        raise HTTPException(status_code=404, detail="Backtest not found")
-    
-    backtest = backtest_results[backtest_id]
+    etag = get_results_etag(store, backtest_id, "metrics")
+    if etag:
+        headers = {"ETag": etag, "Cache-Control": RESULTS_CACHE_CONTROL}
+        if is_not_modified(etag, if_none_match):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
     
-    if backtest.status != "completed" or not backtest.results:
-        raise HTTPException(status_code=400, detail="Backtest not completed or no results")
+    results = get_completed_results(store, backtest_id)
     
     try:
-        results = backtest.results
-        
-        # Extract metrics
-        metrics = {}
-        
-        if 'combined_metrics' in results:
-            metrics.update(results['combined_metrics'])
+        symbol_metrics = {
+            symbol: symbol_result['metrics']
+            for symbol, symbol_result in results.get('symbol_results', {}).items()
+            if 'metrics' in symbol_result
+        }
+        if 'combined_metrics' not in results and not symbol_metrics:
+            return {}
         
-        # Add symbol-specific metrics
-        if 'symbol_results' in results:
-            symbol_metrics = {}
-            for symbol, symbol_result in results['symbol_results'].items():
-                if 'metrics' in symbol_result:
-                    symbol_metrics[symbol] = symbol_result['metrics']
-            metrics['symbol_metrics'] = symbol_metrics
+        # Combined metrics plus symbol-specific metrics
+        metrics = dict(results.get('combined_metrics', {}))
+        metrics['symbol_metrics'] = symbol_metrics
         
         return metrics
         
@@ -421,7 +672,8 @@ async def get_backtest_metrics(backtest_id: str):
 @router.post("/export/{backtest_id}")
 async def export_backtest_results(
     backtest_id: str,
-    format: str = "json"
+    format: Literal["json", "csv"] = "json",
+    store: BacktestStore = Depends(get_backtest_store)
 ):
     """
     Export backtest results.
@@ -429,45 +681,37 @@ async def export_backtest_results(
     Args:
         backtest_id: Backtest ID
         format: Export format (json, csv)
+        store: Backtest store
         
     Returns:
         Exported data
     """
-    if backtest_id not in backtest_results:
-        raise HTTPException(status_code=404, detail="Backtest not found")
-    
-    backtest = backtest_results[backtest_id]
-    
-    if backtest.status != "completed" or not backtest.results:
-        raise HTTPException(status_code=400, detail="Backtest not completed or no results")
+    results = get_completed_results(store, backtest_id)
     
     try:
-        # Create appropriate engine for export
-        storage_manager = StorageManager()
-        data_loader = BacktestDataLoader(storage_manager)
-        
         if format == "json":
-            import json
-            return json.dumps(backtest.results, indent=2, default=str)
-        elif format == "csv":
-            # Export portfolio data as CSV
-            import pandas as pd
-            
-            csv_data = []
-            if 'symbol_results' in backtest.results:
-                for symbol, symbol_result in backtest.results['symbol_results'].items():
-                    if 'portfolio' in symbol_result and not symbol_result['portfolio'].empty:
-                        portfolio_df = symbol_result['portfolio']
-                        portfolio_df['symbol'] = symbol
-                        csv_data.append(portfolio_df)
-            
-            if csv_data:
-                combined_df = pd.concat(csv_data, ignore_index=True)
-                return combined_df.to_csv(index=False)
-            else:
-                return "No portfolio data to export"
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported format")
+            # Objects orjson cannot encode natively (e.g. DataFrames) fall back to str
+            return Response(
+                content=orjson.dumps(results, default=str, option=EXPORT_JSON_OPTIONS),
+                media_type="application/json"
+            )
+        
+        # Export portfolio data as CSV, streamed one symbol at a time
+        portfolios = [
+            (symbol, symbol_result['portfolio'])
+            for symbol, symbol_result in results.get('symbol_results', {}).items()
+            if 'portfolio' in symbol_result and not symbol_result['portfolio'].empty
+        ]
+        
+        if not portfolios:
+            return "No portfolio data to export"
+        
+        def generate_csv():
+            for i, (symbol, portfolio_df) in enumerate(portfolios):
+                # assign returns a new frame, leaving the loaded results untouched
+                yield portfolio_df.assign(symbol=symbol).to_csv(index=False, header=(i == 0)).encode()
+        
+        return StreamingResponse(generate_csv(), media_type="text/csv")
             
     except Exception as e:
         logger.error(f"Error exporting backtest {backtest_id}: {e}")
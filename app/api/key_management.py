@@ -3,25 +3,61 @@ API key management endpoints for the trading data scraper.
 Allows users to add, update, and manage API keys through the web interface.
 """
 from fastapi import APIRouter, HTTPException, Form, Request
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any, Optional
+from datetime import datetime, timezone
 import logging
 
+import aiohttp
+
 from app.security.vault import CredentialVault
 from app.config import KEYS_PATH
 
 logger = logging.getLogger(__name__)
 
 # Create router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Initialize vault (will be set by main app)
 vault: Optional[CredentialVault] = None
 
+# Services that accept API keys, in display order
+KEY_SERVICES = ("finnhub", "twelvedata", "alphavantage", "edgar", "fmp", "reddit")
+VALID_SERVICES = frozenset(KEY_SERVICES)
+VALID_SERVICES_MSG = ", ".join(KEY_SERVICES)
+
+# Shared HTTP session for key test probes, reused across requests
+probe_session: Optional[aiohttp.ClientSession] = None
+
+# Probe timeout, so a slow vendor does not stall the request
+KEY_TEST_TIMEOUT = 5  # seconds
+
+# Connection pool settings for the probe session
+KEY_TEST_POOL_LIMIT = 20
+KEY_TEST_DNS_CACHE_TTL = 300  # seconds
+
 def set_vault(vault_instance: CredentialVault):
     """Set the vault instance from main app."""
     global vault
     vault = vault_instance
 
+def get_probe_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session for key test probes."""
+    global probe_session
+    if probe_session is None or probe_session.closed:
+        probe_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=KEY_TEST_TIMEOUT),
+            connector=aiohttp.TCPConnector(limit=KEY_TEST_POOL_LIMIT, ttl_dns_cache=KEY_TEST_DNS_CACHE_TTL)
+        )
+    return probe_session
+
+async def close_probe_session():
+    """Close the shared HTTP session for key test probes."""
+    global probe_session
+    if probe_session is not None:
+        await probe_session.close()
+        probe_session = None
+
 @router.get("/keys")
 async def get_api_keys():
     """Get list of configured API keys (without revealing the actual keys)."""
@@ -29,12 +65,11 @@ async def get_api_keys():
         raise HTTPException(status_code=401, detail="Vault not unlocked")
     
     try:
-        services = vault.list_services()
+        # One decrypt; the configured services are the credentials' keys
+        credentials = vault.get_credentials()
         key_info = {}
         
-        for service in services:
-            credentials = vault.get_credentials()
-            service_data = credentials.get(service, {})
+        for service, service_data in credentials.items():
             key_info[service] = {
                 "configured": bool(service_data.get('api_key')),
                 "has_key": bool(service_data.get('api_key')),
@@ -62,11 +97,10 @@ async def add_api_key(
     
     try:
         # Validate service name
-        valid_services = ["finnhub", "twelvedata", "alphavantage", "edgar", "fmp", "reddit"]
-        if service not in valid_services:
+        if service not in VALID_SERVICES:
             raise HTTPException(
                 status_code=400, 
-                detail=f"Invalid service. Must be one of: {', '.join(valid_services)}"
+                detail=f"Invalid service. Must be one of: {VALID_SERVICES_MSG}"
             )
         
         # Store the API key
@@ -74,7 +108,7 @@ async def add_api_key(
             service, 
             api_key, 
             description=description,
-            last_updated=vault._get_or_create_salt().hex()[:8]  # Simple timestamp
+            last_updated=datetime.now(timezone.utc).isoformat(timespec='seconds')
         )
         
         if success:
@@ -124,7 +158,6 @@ async def get_key_status():
         }
     
     try:
-        services = vault.list_services()
         credentials = vault.get_credentials()
         
         status = {
@@ -133,7 +166,7 @@ async def get_key_status():
         }
         
         # Check each service
-        for service in ["finnhub", "twelvedata", "alphavantage", "edgar", "fmp"]:
+        for service in KEY_SERVICES:
             service_data = credentials.get(service, {})
             has_key = bool(service_data.get('api_key'))
             
@@ -182,26 +215,25 @@ async def test_api_key(service: str):
 async def _test_finnhub_key(api_key: str) -> Dict[str, Any]:
     """Test Finnhub API key."""
     try:
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            url = "https://finnhub.io/api/v1/quote"
-            params = {"symbol": "AAPL", "token": api_key}
-            
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {
-                        "service": "finnhub",
-                        "status": "valid",
-                        "message": "API key is valid and working",
-                        "test_data": {"symbol": "AAPL", "price": data.get('c', 'N/A')}
-                    }
-                else:
-                    return {
-                        "service": "finnhub",
-                        "status": "invalid",
-                        "message": f"API returned status {response.status}"
-                    }
+        session = get_probe_session()
+        url = "https://finnhub.io/api/v1/quote"
+        params = {"symbol": "AAPL", "token": api_key}
+        
+        async with session.get(url, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                return {
+                    "service": "finnhub",
+                    "status": "valid",
+                    "message": "API key is valid and working",
+                    "test_data": {"symbol": "AAPL", "price": data.get('c', 'N/A')}
+                }
+            else:
+                return {
+                    "service": "finnhub",
+                    "status": "invalid",
+                    "message": f"API returned status {response.status}"
+                }
     except Exception as e:
         return {
             "service": "finnhub",
@@ -212,26 +244,25 @@ async def _test_finnhub_key(api_key: str) -> Dict[str, Any]:
 async def _test_twelvedata_key(api_key: str) -> Dict[str, Any]:
     """Test TwelveData API key."""
     try:
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            url = "https://api.twelvedata.com/quote"
-            params = {"symbol": "AAPL", "apikey": api_key}
-            
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {
-                        "service": "twelvedata",
-                        "status": "valid",
-                        "message": "API key is valid and working",
-                        "test_data": {"symbol": "AAPL", "price": data.get('close', 'N/A')}
-                    }
-                else:
-                    return {
-                        "service": "twelvedata",
-                        "status": "invalid",
-                        "message": f"API returned status {response.status}"
-                    }
+        session = get_probe_session()
+        url = "https://api.twelvedata.com/quote"
+        params = {"symbol": "AAPL", "apikey": api_key}
+        
+        async with session.get(url, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                return {
+                    "service": "twelvedata",
+                    "status": "valid",
+                    "message": "API key is valid and working",
+                    "test_data": {"symbol": "AAPL", "price": data.get('close', 'N/A')}
+                }
+            else:
+                return {
+                    "service": "twelvedata",
+                    "status": "invalid",
+                    "message": f"API returned status {response.status}"
+                }
     except Exception as e:
         return {
             "service": "twelvedata",
@@ -242,30 +273,29 @@ async def _test_twelvedata_key(api_key: str) -> Dict[str, Any]:
 async def _test_alphavantage_key(api_key: str) -> Dict[str, Any]:
     """Test Alpha Vantage API key."""
     try:
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            url = "https://www.alphavantage.co/query"
-            params = {
-                "function": "GLOBAL_QUOTE",
-                "symbol": "AAPL",
-                "apikey": api_key
-            }
-            
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {
-                        "service": "alphavantage",
-                        "status": "valid",
-                        "message": "API key is valid and working",
-                        "test_data": {"symbol": "AAPL", "price": data.get('Global Quote', {}).get('05. price', 'N/A')}
-                    }
-                else:
-                    return {
-                        "service": "alphavantage",
-                        "status": "invalid",
-                        "message": f"API returned status {response.status}"
-                    }
+        session = get_probe_session()
+        url = "https://www.alphavantage.co/query"
+        params = {
+            "function": "GLOBAL_QUOTE",
+            "symbol": "AAPL",
+            "apikey": api_key
+        }
+        
+        async with session.get(url, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                return {
+                    "service": "alphavantage",
+                    "status": "valid",
+                    "message": "API key is valid and working",
+                    "test_data": {"symbol": "AAPL", "price": data.get('Global Quote', {}).get('05. price', 'N/A')}
+                }
+            else:
+                return {
+                    "service": "alphavantage",
+                    "status": "invalid",
+                    "message": f"API returned status {response.status}"
+                }
     except Exception as e:
         return {
             "service": "alphavantage",
@@ -2,47 +2,302 @@
 FastAPI routes for the trading data scraper API.
 Provides REST endpoints for querying data and system status.
 """
-from fastapi import APIRouter, HTTPException, Query, Path
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Path, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from datetime import datetime, timezone
+import asyncio
+import base64
+import binascii
+import functools
 import logging
+import sqlite3
+import threading
+import time
+
+import orjson
 
 from app.core.storage import StorageManager
+from app.core.storage_simple import record_position
 from app.core.rate_limiter import rate_limiter
 from app.config import DATA_PATH, DB_PATH
 
 logger = logging.getLogger(__name__)
 
 # Create router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+class SymbolEntry(BaseModel):
+    """Symbol enrollment model."""
+    symbol: str = Field(..., description="Stock symbol")
+    exchange: Optional[str] = Field(None, description="Exchange name")
+
 
 # Initialize storage manager
 storage = StorageManager(DATA_PATH, DB_PATH)
 
+# Constant response bodies, encoded once at import
+ROOT_JSON = orjson.dumps({
+    "name": "NeuroTradeAI Data Scraper API",
+    "version": "1.0.0",
+    "description": "Real-time trading data ingestion and query API",
+    "endpoints": {
+        "bars": "/bars/{symbol}",
+        "news": "/news",
+        "filings": "/filings/{symbol}",
+        "metrics": "/metrics",
+        "health": "/health"
+    }
+})
+DEFAULT_SETTINGS_JSON = orjson.dumps({
+    "polling_interval": 60,
+    "max_symbols": 50,
+    "retention_days": 365,
+    "auto_cleanup": True,
+    "error_alerts": True,
+    "rate_limit_alerts": True
+})
+
+# /health body around its timestamp, which is the only part that changes
+HEALTH_JSON_PREFIX = b'{"status":"healthy","timestamp":"'
+HEALTH_JSON_SUFFIX = b'","version":"1.0.0"}'
+
+# Row counts reported by /metrics, keyed by table
+STATS_TABLES = {
+    "symbols": "symbols",
+    "fetch_logs": "fetch_log",
+    "news_metadata": "news_metadata",
+    "filings_metadata": "filings_metadata"
+}
+
+# Single statement counting every table in STATS_TABLES
+STATS_SQL = "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table})" for table in STATS_TABLES.values())
+
+# Newest bar per symbol; the grouped MAX is answered from BARS_INDEX_SQL's index
+LATEST_BARS_SQL = """
+    SELECT b.symbol, b.timestamp, b.open, b.high, b.low, b.close, b.volume
+    FROM bars b
+    JOIN (
+        SELECT symbol, MAX(timestamp) AS latest
+        FROM bars
+        GROUP BY symbol
+    ) m ON b.symbol = m.symbol AND b.timestamp = m.latest
+    ORDER BY b.symbol
+"""
+BARS_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_bars_symbol_ts ON bars(symbol, timestamp DESC)"
+# No code here creates bars, so the index is only built once the table exists
+BARS_TABLE_SQL = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bars'"
+
+# Symbol statements, kept as constants so each connection's statement cache reuses them
+SYMBOLS_SQL = "SELECT * FROM symbols"
+UPSERT_SYMBOL_SQL = """
+    INSERT OR REPLACE INTO symbols (symbol, exchange, last_update_utc, enabled)
+    VALUES (?, ?, ?, ?)
+"""
+DELETE_SYMBOL_SQL = "DELETE FROM symbols WHERE symbol = ?"
+
+# Prepared statements each route connection keeps cached
+DB_CACHED_STATEMENTS = 512
+
+# In-flight /bars loads keyed by query, so concurrent identical requests share one read
+_bars_inflight: Dict[Tuple, asyncio.Future] = {}
+
+# Bars encoded per chunk when streaming /bars
+BARS_STREAM_CHUNK = 1000
+
+# Settings applied to each persistent route connection
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache
+    "PRAGMA mmap_size=268435456"  # 256 MiB memory map
+)
+
+# Executor threads keep one open connection each instead of reconnecting per query
+_db_local = threading.local()
+
+# Seconds each read endpoint's encoded response is served from memory
+RESPONSE_CACHE_TTL = {
+    "latest": 5,
+    "symbols": 60,
+    "metrics": 2
+}
+
+# Encoded JSON bodies keyed by endpoint, with their expiry on the monotonic clock
+_response_cache: Dict[str, Tuple[float, bytes]] = {}
+
+# Latest bar of each symbol with its expiry, shared by /latest and /data/latest
+_latest_snapshot: Optional[Tuple[float, Dict[str, Dict[str, Any]]]] = None
+
+def _encode_cursor(record: Dict[str, Any], field: str, tie_field: Optional[str]) -> str:
+    """Encode the record_position of a page's last record as an opaque cursor."""
+    position = record_position(record, field, tie_field)
+    return base64.urlsafe_b64encode(orjson.dumps(position)).decode()
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    """Decode a cursor from _encode_cursor, raising 400 if it is malformed."""
+    if not cursor:
+        return None
+    try:
+        field_value, tie_value = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return str(field_value), str(tie_value)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _next_cursor(records: List[Dict[str, Any]], limit: int, field: str,
+                 tie_field: Optional[str]) -> Optional[str]:
+    """Cursor for the page after records, or None if this was the last page."""
+    if limit <= 0 or len(records) < limit:
+        return None
+    return _encode_cursor(records[-1], field, tie_field)
+
+def _get_db() -> sqlite3.Connection:
+    """Get this thread's persistent autocommit connection to DB_PATH."""
+    conn = getattr(_db_local, "conn", None)
+    if conn is None or _db_local.path != DB_PATH:
+        conn = sqlite3.connect(DB_PATH, isolation_level=None, cached_statements=DB_CACHED_STATEMENTS)
+        for pragma in DB_PRAGMAS:
+            conn.execute(pragma)
+        _db_local.conn, _db_local.path = conn, DB_PATH
+        _db_local.bars_indexed = False
+    return conn
+
+def _get_cached(key: str) -> Optional[Response]:
+    """Get the cached response for an endpoint if it has not expired."""
+    entry = _response_cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return Response(entry[1], media_type="application/json")
+
+def _set_cached(key: str, data: Any) -> Response:
+    """Encode an endpoint's result, cache it for its TTL and return it as a response."""
+    body = orjson.dumps(data)
+    _response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL[key], body)
+    return Response(body, media_type="application/json")
+
+def _invalidate_cached(*keys: str):
+    """Drop cached responses so the next request reads the database."""
+    global _latest_snapshot
+    for key in keys:
+        _response_cache.pop(key, None)
+    if "latest" in keys:
+        _latest_snapshot = None
+
+def _json_default(value: Any) -> Any:
+    """Encode values orjson does not handle natively, such as pandas Timestamps."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+def _stream_bars(header: Dict[str, Any], bars) -> Iterator[bytes]:
+    """Yield the /bars JSON document, encoding the bars a chunk at a time."""
+    yield orjson.dumps(header, default=_json_default)[:-1] + b',"bars":['
+    if hasattr(bars, "itertuples"):
+        columns = list(bars.columns)
+        bars = (dict(zip(columns, row)) for row in bars.itertuples(index=False, name=None))
+    chunk = []
+    first = True
+    for bar in bars:
+        chunk.append(orjson.dumps(bar, option=orjson.OPT_SERIALIZE_NUMPY, default=_json_default))
+        if len(chunk) == BARS_STREAM_CHUNK:
+            yield (b"" if first else b",") + b",".join(chunk)
+            chunk, first = [], False
+    if chunk:
+        yield (b"" if first else b",") + b",".join(chunk)
+    yield b"]}"
+
+async def _run_db(func, *args, **kwargs):
+    """Run a blocking SQLite or storage helper in the default executor, off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+async def _load_bars(symbol: str, start: Optional[str], end: Optional[str], interval: str):
+    """Load bars off the event loop, joining an identical load that is already running."""
+    key = (symbol, start, end, interval)
+    future = _bars_inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_run_db(storage.query_ohlcv, *key))
+        _bars_inflight[key] = future
+        future.add_done_callback(lambda _: _bars_inflight.pop(key, None))
+    # Shielded so one client disconnecting does not cancel the others' load
+    return await asyncio.shield(future)
+
+def _query_symbols() -> List[Dict[str, Any]]:
+    """Load all tracked symbols."""
+    cursor = _get_db().cursor()
+    cursor.row_factory = sqlite3.Row
+    return [dict(row) for row in cursor.execute(SYMBOLS_SQL)]
+
+def _query_latest_bars() -> List[tuple]:
+    """Load the latest bar of each symbol."""
+    conn = _get_db()
+    if not _db_local.bars_indexed and conn.execute(BARS_TABLE_SQL).fetchone():
+        conn.execute(BARS_INDEX_SQL)
+        _db_local.bars_indexed = True
+    return conn.execute(LATEST_BARS_SQL).fetchall()
+
+async def load_latest_data() -> Dict[str, Dict[str, Any]]:
+    """Get the latest bar of each symbol, reusing the snapshot for the /latest TTL."""
+    global _latest_snapshot
+    if _latest_snapshot is not None and _latest_snapshot[0] > time.monotonic():
+        return _latest_snapshot[1]
+    
+    rows = await _run_db(_query_latest_bars)
+    
+    # Convert to dictionary format
+    latest_data = {}
+    for row in rows:
+        symbol, timestamp, open_price, high, low, close, volume = row
+        latest_data[symbol] = {
+            "price": close,
+            "open": open_price,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+            "change": 0,  # Calculate if needed
+            "change_percent": 0,  # Calculate if needed
+            "timestamp": timestamp,
+            "signal": "HOLD",  # Default signal
+            "rsi": 50,  # Default RSI
+            "bb_position": 0.5  # Default BB position
+        }
+    
+    _latest_snapshot = (time.monotonic() + RESPONSE_CACHE_TTL["latest"], latest_data)
+    return latest_data
+
+def _upsert_symbols(entries: List[Tuple[str, Optional[str]]]):
+    """Insert or replace tracked symbols in a single transaction."""
+    now = datetime.now(timezone.utc).isoformat()
+    conn = _get_db()
+    conn.execute("BEGIN")
+    try:
+        conn.executemany(UPSERT_SYMBOL_SQL, [(symbol, exchange, now, 1) for symbol, exchange in entries])
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def _delete_symbol(symbol: str):
+    """Delete a tracked symbol."""
+    _get_db().execute(DELETE_SYMBOL_SQL, (symbol,))
+
+def _count_tables() -> Dict[str, int]:
+    """Count the rows of each table reported by /metrics in one query."""
+    row = _get_db().execute(STATS_SQL).fetchone()
+    return dict(zip(STATS_TABLES, row))
+
 @router.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
-        "name": "NeuroTradeAI Data Scraper API",
-        "version": "1.0.0",
-        "description": "Real-time trading data ingestion and query API",
-        "endpoints": {
-            "bars": "/bars/{symbol}",
-            "news": "/news",
-            "filings": "/filings/{symbol}",
-            "metrics": "/metrics",
-            "health": "/health"
-        }
-    }
+    return Response(content=ROOT_JSON, media_type="application/json")
 
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "version": "1.0.0"
-    }
+    timestamp = datetime.now(timezone.utc).isoformat().encode()
+    return Response(content=HEALTH_JSON_PREFIX + timestamp + HEALTH_JSON_SUFFIX, media_type="application/json")
 
 @router.get("/bars/{symbol}")
 async def get_bars(
@@ -61,13 +316,13 @@ async def get_bars(
         end: End date in ISO format
         
     Returns:
-        List of OHLCV bars
+        List of OHLCV bars, streamed as they are encoded
     """
     try:
-        # Query data from storage
-        df = storage.query_ohlcv(symbol, start, end, interval)
+        # Query data from storage (a DataFrame, or a list without pandas)
+        bars = await _load_bars(symbol, start, end, interval)
         
-        if df.empty:
+        if len(bars) == 0:
             return {
                 "symbol": symbol,
                 "interval": interval,
@@ -75,20 +330,19 @@ async def get_bars(
                 "count": 0
             }
         
-        # Convert DataFrame to list of dicts (or use list directly if not DataFrame)
-        if hasattr(df, 'to_dict'):
-            bars = df.to_dict('records')
+        if hasattr(bars, 'iloc'):
+            start_date, end_date = bars['timestamp_utc'].iloc[0], bars['timestamp_utc'].iloc[-1]
         else:
-            bars = df if isinstance(df, list) else []
+            start_date, end_date = bars[0]["timestamp_utc"], bars[-1]["timestamp_utc"]
         
-        return {
+        header = {
             "symbol": symbol,
             "interval": interval,
-            "bars": bars,
             "count": len(bars),
-            "start_date": bars[0]["timestamp_utc"] if bars else None,
-            "end_date": bars[-1]["timestamp_utc"] if bars else None
+            "start_date": start_date,
+            "end_date": end_date
         }
+        return StreamingResponse(_stream_bars(header, bars), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error querying bars for {symbol}: {e}")
@@ -100,7 +354,8 @@ async def get_news(
     since: Optional[str] = Query(None, description="Filter by date (ISO format)"),
     limit: int = Query(100, description="Maximum number of results"),
     sentiment_min: Optional[float] = Query(None, description="Minimum sentiment score"),
-    sentiment_max: Optional[float] = Query(None, description="Maximum sentiment score")
+    sentiment_max: Optional[float] = Query(None, description="Maximum sentiment score"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ):
     """
     Get news articles.
@@ -111,33 +366,26 @@ async def get_news(
         limit: Maximum number of results
         sentiment_min: Minimum sentiment score (-1.0 to 1.0)
         sentiment_max: Maximum sentiment score (-1.0 to 1.0)
+        cursor: Continue after the page that returned this cursor
         
     Returns:
-        List of news articles
+        List of news articles and the cursor of the next page
     """
+    before = _decode_cursor(cursor)
     try:
-        # Query news from storage
-        news = storage.query_news(ticker, since)
-        
-        # Apply sentiment filtering if provided
-        if sentiment_min is not None or sentiment_max is not None:
-            filtered_news = []
-            for article in news:
-                sentiment = article.get('sentiment_score', 0.0)
-                if sentiment_min is not None and sentiment < sentiment_min:
-                    continue
-                if sentiment_max is not None and sentiment > sentiment_max:
-                    continue
-                filtered_news.append(article)
-            news = filtered_news
-        
-        # Apply limit
-        if limit > 0:
-            news = news[:limit]
+        # Query news from storage, filtered and paged there
+        news = await _run_db(
+            storage.query_news, ticker, since,
+            limit=limit if limit > 0 else None,
+            before=before,
+            sentiment_min=sentiment_min,
+            sentiment_max=sentiment_max
+        )
         
         return {
             "news": news,
             "count": len(news),
+            "next_cursor": _next_cursor(news, limit, 'timestamp_utc', 'id'),
             "filters": {
                 "ticker": ticker,
                 "since": since,
@@ -151,41 +399,6 @@ async def get_news(
         logger.error(f"Error querying news: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/filings/{symbol}")
-async def get_filings(
-    symbol: str = Path(..., description="Stock symbol"),
-    filing_type: Optional[str] = Query(None, description="Filter by filing type"),
-    since: Optional[str] = Query(None, description="Filter by date (ISO format)")
-):
-    """
-    Get SEC filings for a symbol.
-    
-    Args:
-        symbol: Stock symbol
-        filing_type: Filter by filing type (10-K, 10-Q, 8-K)
-        since: Filter by date (ISO format)
-        
-    Returns:
-        List of SEC filings
-    """
-    try:
-        # Query filings from storage
-        # This would be implemented based on the storage layer
-        # For now, return empty result
-        return {
-            "symbol": symbol,
-            "filings": [],
-            "count": 0,
-            "filters": {
-                "filing_type": filing_type,
-                "since": since
-            }
-        }
-        
-    except Exception as e:
-        logger.error(f"Error querying filings for {symbol}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
 @router.get("/news/sentiment")
 async def get_news_sentiment(
     ticker: Optional[str] = Query(None, description="Filter by ticker symbol"),
@@ -204,38 +417,12 @@ async def get_news_sentiment(
         Sentiment analysis results
     """
     try:
-        # Query news from storage
-        news = storage.query_news(ticker, since)
-        
-        if not news:
-            return {
-                "sentiment": {
-                    "average": 0.0,
-                    "positive_count": 0,
-                    "negative_count": 0,
-                    "neutral_count": 0,
-                    "total_count": 0
-                },
-                "ticker": ticker,
-                "timeframe": f"{hours} hours"
-            }
-        
-        # Calculate sentiment statistics
-        sentiments = [article.get('sentiment_score', 0.0) for article in news]
-        positive_count = sum(1 for s in sentiments if s > 0.1)
-        negative_count = sum(1 for s in sentiments if s < -0.1)
-        neutral_count = len(sentiments) - positive_count - negative_count
-        
-        average_sentiment = sum(sentiments) / len(sentiments) if sentiments else 0.0
+        # Aggregate sentiment in storage
+        sentiment = await _run_db(storage.get_sentiment_stats, ticker, since)
+        sentiment["average"] = round(sentiment["average"], 3)
         
         return {
-            "sentiment": {
-                "average": round(average_sentiment, 3),
-                "positive_count": positive_count,
-                "negative_count": negative_count,
-                "neutral_count": neutral_count,
-                "total_count": len(sentiments)
-            },
+            "sentiment": sentiment,
             "ticker": ticker,
             "timeframe": f"{hours} hours"
         }
@@ -252,18 +439,22 @@ async def get_metrics():
     Returns:
         System metrics including rate limits, storage stats, etc.
     """
+    cached = _get_cached("metrics")
+    if cached is not None:
+        return cached
+
     try:
         # Get rate limiter status
         rate_limits = rate_limiter.get_status()
         
         # Get storage statistics
-        storage_stats = storage.get_storage_stats()
+        storage_stats = await _run_db(storage.get_storage_stats)
         
         # Get database statistics
         db_stats = await _get_database_stats()
         
-        return {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+        return _set_cached("metrics", {
+            "timestamp": datetime.now(timezone.utc),
             "rate_limits": rate_limits,
             "storage": storage_stats,
             "database": db_stats,
@@ -271,7 +462,7 @@ async def get_metrics():
                 "status": "running",
                 "uptime": "N/A"  # Would be calculated from start time
             }
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error getting metrics: {e}")
@@ -285,22 +476,18 @@ async def get_symbols():
     Returns:
         List of symbols with metadata
     """
+    cached = _get_cached("symbols")
+    if cached is not None:
+        return cached
+
     try:
         # Query symbols from database
-        import sqlite3
+        symbols = await _run_db(_query_symbols)
         
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM symbols")
-            rows = cursor.fetchall()
-            
-            columns = [description[0] for description in cursor.description]
-            symbols = [dict(zip(columns, row)) for row in rows]
-        
-        return {
+        return _set_cached("symbols", {
             "symbols": symbols,
             "count": len(symbols)
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error querying symbols: {e}")
@@ -314,47 +501,15 @@ async def get_latest_data():
     Returns:
         Dictionary of latest data for each symbol
     """
+    cached = _get_cached("latest")
+    if cached is not None:
+        return cached
+
     try:
-        import sqlite3
-        import json
-        
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            
-            # Get latest data for each symbol
-            cursor.execute("""
-                SELECT symbol, timestamp, open, high, low, close, volume
-                FROM bars 
-                WHERE timestamp = (
-                    SELECT MAX(timestamp) 
-                    FROM bars b2 
-                    WHERE b2.symbol = bars.symbol
-                )
-                ORDER BY symbol
-            """)
-            
-            rows = cursor.fetchall()
-            
-            # Convert to dictionary format
-            latest_data = {}
-            for row in rows:
-                symbol, timestamp, open_price, high, low, close, volume = row
-                latest_data[symbol] = {
-                    "price": close,
-                    "open": open_price,
-                    "high": high,
-                    "low": low,
-                    "close": close,
-                    "volume": volume,
-                    "change": 0,  # Calculate if needed
-                    "change_percent": 0,  # Calculate if needed
-                    "timestamp": timestamp,
-                    "signal": "HOLD",  # Default signal
-                    "rsi": 50,  # Default RSI
-                    "bb_position": 0.5  # Default BB position
-                }
-        
-        return latest_data
+        # Get latest data for each symbol
+        latest_data = await load_latest_data()
+        
+        return _set_cached("latest", latest_data)
         
     except Exception as e:
         logger.error(f"Error getting latest data: {e}")
@@ -369,7 +524,7 @@ async def get_latest_data():
                 "volume": 45000000,
                 "change": 0.45,
                 "change_percent": 0.30,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": datetime.now(timezone.utc),
                 "signal": "BUY",
                 "rsi": 45.2,
                 "bb_position": 0.3
@@ -383,7 +538,7 @@ async def get_latest_data():
                 "volume": 28000000,
                 "change": 1.25,
                 "change_percent": 0.38,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": datetime.now(timezone.utc),
                 "signal": "HOLD",
                 "rsi": 52.8,
                 "bb_position": 0.6
@@ -397,13 +552,40 @@ async def get_latest_data():
                 "volume": 1200000,
                 "change": 5.60,
                 "change_percent": 0.20,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": datetime.now(timezone.utc),
                 "signal": "SELL",
                 "rsi": 65.4,
                 "bb_position": 0.8
             }
         }
 
+@router.post("/symbols/batch")
+async def add_symbols(entries: List[SymbolEntry]):
+    """
+    Add several symbols to tracking at once.
+    
+    Args:
+        entries: Symbols to add, each with an optional exchange
+        
+    Returns:
+        Status of each added symbol
+    """
+    try:
+        await _run_db(_upsert_symbols, [(entry.symbol, entry.exchange) for entry in entries])
+        _invalidate_cached("symbols", "latest")
+        
+        return {
+            "symbols": [
+                {"symbol": entry.symbol, "exchange": entry.exchange, "status": "added"}
+                for entry in entries
+            ],
+            "count": len(entries)
+        }
+        
+    except Exception as e:
+        logger.error(f"Error adding {len(entries)} symbols: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/symbols/{symbol}")
 async def add_symbol(
     symbol: str = Path(..., description="Stock symbol"),
@@ -420,15 +602,8 @@ async def add_symbol(
         Confirmation message
     """
     try:
-        import sqlite3
-        
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO symbols (symbol, exchange, last_update_utc, enabled)
-                VALUES (?, ?, ?, ?)
-            """, (symbol, exchange, datetime.now(timezone.utc).isoformat(), 1))
-            conn.commit()
+        await _run_db(_upsert_symbols, [(symbol, exchange)])
+        _invalidate_cached("symbols", "latest")
         
         return {
             "message": f"Symbol {symbol} added successfully",
@@ -452,12 +627,8 @@ async def remove_symbol(symbol: str = Path(..., description="Stock symbol")):
         Confirmation message
     """
     try:
-        import sqlite3
-        
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM symbols WHERE symbol = ?", (symbol,))
-            conn.commit()
+        await _run_db(_delete_symbol, symbol)
+        _invalidate_cached("symbols", "latest")
         
         return {
             "message": f"Symbol {symbol} removed successfully",
@@ -471,31 +642,7 @@ async def remove_symbol(symbol: str = Path(..., description="Stock symbol")):
 async def _get_database_stats() -> Dict[str, Any]:
     """Get database statistics."""
     try:
-        import sqlite3
-        
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            
-            # Get table counts
-            cursor.execute("SELECT COUNT(*) FROM symbols")
-            symbol_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM fetch_log")
-            log_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM news_metadata")
-            news_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM filings_metadata")
-            filing_count = cursor.fetchone()[0]
-            
-            return {
-                "symbols": symbol_count,
-                "fetch_logs": log_count,
-                "news_metadata": news_count,
-                "filings_metadata": filing_count
-            }
-            
+        return await _run_db(_count_tables)
     except Exception as e:
         logger.error(f"Error getting database stats: {e}")
         return {}
@@ -505,7 +652,8 @@ async def get_filings(
     symbol: Optional[str] = Query(None, description="Filter by symbol"),
     filing_type: Optional[str] = Query(None, description="Filter by filing type (10-K, 10-Q, 8-K)"),
     since: Optional[str] = Query(None, description="Filter by date (ISO format)"),
-    limit: int = Query(100, description="Maximum number of results")
+    limit: int = Query(100, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ):
     """
     Get SEC filings.
@@ -515,20 +663,22 @@ async def get_filings(
         filing_type: Filter by filing type
         since: Filter by date
         limit: Maximum number of results
+        cursor: Continue after the page that returned this cursor
         
     Returns:
-        List of SEC filings
+        List of SEC filings and the cursor of the next page
     """
+    before = _decode_cursor(cursor)
     try:
-        filings = storage.query_filings(symbol, filing_type, since)
-        
-        # Apply limit
-        if limit > 0:
-            filings = filings[:limit]
+        filings = await _run_db(
+            storage.query_filings, symbol, filing_type, since,
+            limit=limit if limit > 0 else None, before=before
+        )
         
         return {
             "filings": filings,
             "count": len(filings),
+            "next_cursor": _next_cursor(filings, limit, 'filing_date', None),
             "filters": {
                 "symbol": symbol,
                 "filing_type": filing_type,
@@ -545,7 +695,8 @@ async def get_symbol_filings(
     symbol: str,
     filing_type: Optional[str] = Query(None, description="Filter by filing type"),
     since: Optional[str] = Query(None, description="Filter by date (ISO format)"),
-    limit: int = Query(50, description="Maximum number of results")
+    limit: int = Query(50, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ):
     """
     Get SEC filings for a specific symbol.
@@ -555,21 +706,23 @@ async def get_symbol_filings(
         filing_type: Filter by filing type
         since: Filter by date
         limit: Maximum number of results
+        cursor: Continue after the page that returned this cursor
         
     Returns:
-        List of SEC filings for the symbol
+        List of SEC filings for the symbol and the cursor of the next page
     """
+    before = _decode_cursor(cursor)
     try:
-        filings = storage.query_filings(symbol, filing_type, since)
-        
-        # Apply limit
-        if limit > 0:
-            filings = filings[:limit]
+        filings = await _run_db(
+            storage.query_filings, symbol, filing_type, since,
+            limit=limit if limit > 0 else None, before=before
+        )
         
         return {
             "symbol": symbol,
             "filings": filings,
             "count": len(filings),
+            "next_cursor": _next_cursor(filings, limit, 'filing_date', None),
             "filters": {
                 "filing_type": filing_type,
                 "since": since
@@ -588,20 +741,8 @@ async def get_system_settings():
     Returns:
         Current system settings
     """
-    try:
-        # Return default settings for now
-        return {
-            "polling_interval": 60,
-            "max_symbols": 50,
-            "retention_days": 365,
-            "auto_cleanup": True,
-            "error_alerts": True,
-            "rate_limit_alerts": True
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting system settings: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Return default settings for now
+    return Response(content=DEFAULT_SETTINGS_JSON, media_type="application/json")
 
 @router.post("/settings")
 async def update_system_settings(settings: Dict[str, Any]):
@@ -2,11 +2,13 @@
 Trading API routes.
 REST endpoints for trading control, positions, orders, and performance.
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, FastAPI, HTTPException, BackgroundTasks, Depends, Request, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 from datetime import datetime, timezone
+import asyncio
 import logging
+import time
 import uuid
 import json
 
@@ -18,16 +20,22 @@ from app.trading.strategies.momentum import MomentumStrategy
 from app.trading.strategies.news_driven import NewsDrivenStrategy
 from app.core.trading_db import TradingDatabase
 from app.config import TRADING_CONFIG
+from app.api.routes import load_latest_data
+from app.api.websocket import encode_message
 
 logger = logging.getLogger(__name__)
 
 # Create router
 router = APIRouter(prefix="/api/v1/trading", tags=["trading"])
 
-# Global trading state
-trading_engine = None
-trading_db = None
-websocket_connections = []
+# Global trading state (the engine and database live on app.state)
+websocket_connections: Set[WebSocket] = set()
+
+# Seconds an engine status is reused, to absorb dashboard polling bursts
+STATUS_CACHE_TTL = 1.0
+
+# (expiry, engine, status) of the last engine status computed
+_status_cache: Optional[tuple] = None
 
 
 class TradingStatus(BaseModel):
@@ -115,20 +123,55 @@ class ManualOrderRequest(BaseModel):
     reasoning: str = "Manual order"
 
 
-def get_trading_engine() -> TradingEngine:
+def setup_trading_state(app: FastAPI):
+    """Create the trading engine and database once, at application startup."""
+    app.state.trading_engine = TradingEngine()
+    app.state.trading_db = TradingDatabase("data/trading.db")
+
+
+async def shutdown_trading_state(app: FastAPI):
+    """Stop the trading engine if it is still running."""
+    engine = getattr(app.state, "trading_engine", None)
+    if engine is not None and engine.is_running():
+        await engine.stop()
+
+
+def get_trading_engine(request: Request) -> TradingEngine:
     """Get trading engine instance."""
-    global trading_engine
-    if trading_engine is None:
-        trading_engine = TradingEngine()
-    return trading_engine
+    return request.app.state.trading_engine
 
 
-def get_trading_db() -> TradingDatabase:
+def get_trading_db(request: Request) -> TradingDatabase:
     """Get trading database instance."""
-    global trading_db
-    if trading_db is None:
-        trading_db = TradingDatabase("data/trading.db")
-    return trading_db
+    return request.app.state.trading_db
+
+
+async def get_engine_status(engine: TradingEngine, fresh: bool = False) -> Dict[str, Any]:
+    """
+    Get the engine status, reusing one computed within STATUS_CACHE_TTL.
+    
+    Args:
+        engine: Trading engine instance
+        fresh: Recompute even if a cached status is still valid
+        
+    Returns:
+        Trading system status
+    """
+    global _status_cache
+    now = time.monotonic()
+    if not fresh and _status_cache is not None and _status_cache[0] > now and _status_cache[1] is engine:
+        return _status_cache[2]
+    status = await engine.get_status()
+    _status_cache = (now + STATUS_CACHE_TTL, engine, status)
+    return status
+
+
+async def broadcast_status_update(engine: TradingEngine):
+    """Broadcast the engine status after a state change, skipping the query when no client listens."""
+    global _status_cache
+    _status_cache = None
+    if websocket_connections:
+        await broadcast_trading_update("status_update", await get_engine_status(engine, fresh=True))
 
 
 @router.get("/status", response_model=TradingStatus)
@@ -140,7 +183,7 @@ async def get_trading_status(engine: TradingEngine = Depends(get_trading_engine)
         Trading system status
     """
     try:
-        status = await engine.get_status()
+        status = await get_engine_status(engine)
         return TradingStatus(**status)
     except Exception as e:
         logger.error(f"Error getting trading status: {e}")
@@ -173,7 +216,7 @@ async def arm_trading(
             message = "Live trading disarmed"
         
         # Broadcast status update
-        await broadcast_trading_update("status_update", await engine.get_status())
+        await broadcast_status_update(engine)
         
         return {"message": message, "armed": request.action == "arm"}
         
@@ -208,7 +251,7 @@ async def start_trading(
             await engine.start()
         
         # Broadcast status update
-        await broadcast_trading_update("status_update", await engine.get_status())
+        await broadcast_status_update(engine)
         
         logger.info("Trading engine started")
         return {"message": "Trading engine started successfully"}
@@ -236,7 +279,7 @@ async def stop_trading(engine: TradingEngine = Depends(get_trading_engine)):
         await engine.stop()
         
         # Broadcast status update
-        await broadcast_trading_update("status_update", await engine.get_status())
+        await broadcast_status_update(engine)
         
         logger.info("Trading engine stopped")
         return {"message": "Trading engine stopped successfully"}
@@ -413,12 +456,12 @@ async def trading_websocket(websocket: WebSocket):
         websocket: WebSocket connection
     """
     await websocket.accept()
-    websocket_connections.append(websocket)
+    websocket_connections.add(websocket)
     
     try:
         # Send initial status
-        engine = get_trading_engine()
-        status = await engine.get_status()
+        engine = websocket.app.state.trading_engine
+        status = await get_engine_status(engine)
         await websocket.send_text(json.dumps({
             "type": "status_update",
             "data": status
@@ -429,12 +472,11 @@ async def trading_websocket(websocket: WebSocket):
             await websocket.receive_text()
             
     except WebSocketDisconnect:
-        websocket_connections.remove(websocket)
+        websocket_connections.discard(websocket)
         logger.info("Trading WebSocket disconnected")
     except Exception as e:
         logger.error(f"Trading WebSocket error: {e}")
-        if websocket in websocket_connections:
-            websocket_connections.remove(websocket)
+        websocket_connections.discard(websocket)
 
 
 async def broadcast_trading_update(message_type: str, data: Any):
@@ -451,23 +493,23 @@ async def broadcast_trading_update(message_type: str, data: Any):
     message = {
         "type": message_type,
         "data": data,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": datetime.now(timezone.utc)
     }
     
-    message_text = json.dumps(message)
-    disconnected = []
+    message_text = encode_message(message)
     
-    for websocket in websocket_connections:
-        try:
-            await websocket.send_text(message_text)
-        except Exception as e:
-            logger.error(f"Error broadcasting to WebSocket: {e}")
-            disconnected.append(websocket)
+    # Send to every client concurrently so one slow client does not delay the rest
+    connections = list(websocket_connections)
+    results = await asyncio.gather(
+        *(websocket.send_text(message_text) for websocket in connections),
+        return_exceptions=True
+    )
     
     # Remove disconnected connections
-    for websocket in disconnected:
-        if websocket in websocket_connections:
-            websocket_connections.remove(websocket)
+    for websocket, result in zip(connections, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error broadcasting to WebSocket: {result}")
+            websocket_connections.discard(websocket)
 
 
 @router.get("/risk/status")
@@ -606,53 +648,11 @@ async def get_latest_market_data():
         Dictionary of latest data for each symbol
     """
     try:
-        from app.core.storage import StorageManager
-        from app.config import DATA_PATH, DB_PATH
-        from datetime import datetime, timezone
-        import sqlite3
-        
-        storage = StorageManager(DATA_PATH, DB_PATH)
-        
         # Try to get real data from database
         try:
-            with sqlite3.connect(DB_PATH) as conn:
-                cursor = conn.cursor()
-                
-                # Get latest data for each symbol
-                cursor.execute("""
-                    SELECT symbol, timestamp, open, high, low, close, volume
-                    FROM bars 
-                    WHERE timestamp = (
-                        SELECT MAX(timestamp) 
-                        FROM bars b2 
-                        WHERE b2.symbol = bars.symbol
-                    )
-                    ORDER BY symbol
-                """)
-                
-                rows = cursor.fetchall()
-                
-                # Convert to dictionary format
-                latest_data = {}
-                for row in rows:
-                    symbol, timestamp, open_price, high, low, close, volume = row
-                    latest_data[symbol] = {
-                        "price": close,
-                        "open": open_price,
-                        "high": high,
-                        "low": low,
-                        "close": close,
-                        "volume": volume,
-                        "change": 0,  # Calculate if needed
-                        "change_percent": 0,  # Calculate if needed
-                        "timestamp": timestamp,
-                        "signal": "HOLD",  # Default signal
-                        "rsi": 50,  # Default RSI
-                        "bb_position": 0.5  # Default BB position
-                    }
-                
-                if latest_data:
-                    return latest_data
+            latest_data = await load_latest_data()
+            if latest_data:
+                return latest_data
         except Exception as db_error:
             logger.warning(f"Database query failed, using sample data: {db_error}")
         
@@ -3,79 +3,130 @@ WebSocket handler for real-time data streaming.
 Provides live updates to connected clients.
 """
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
+from datetime import datetime, timezone
 import json
 import asyncio
 import logging
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# orjson options for broadcast messages (engine data may hold numpy values or int keys)
+MESSAGE_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Seconds OHLCV ticks are collected before being broadcast as one batch
+OHLCV_FLUSH_INTERVAL = 0.1
+
+# Messages buffered per client before it is dropped as a slow consumer
+SEND_QUEUE_SIZE = 32
+
+# Close code sent to dropped slow consumers (1013: try again later)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
 class ConnectionManager:
     """Manages WebSocket connections for real-time data streaming."""
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
         self.subscriptions: Dict[WebSocket, List[str]] = {}
+        # Reverse index of subscriptions, so fan-out only visits a data type's subscribers
+        self.topic_subs: Dict[str, Set[WebSocket]] = {}
+        # Each connection's outgoing messages, drained by its own relay task
+        self.queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.relay_tasks: Dict[WebSocket, asyncio.Task] = {}
+        self.close_tasks: Set[asyncio.Task] = set()
     
     async def connect(self, websocket: WebSocket):
         """Accept a new WebSocket connection."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         self.subscriptions[websocket] = []
+        queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.queues[websocket] = queue
+        self.relay_tasks[websocket] = asyncio.create_task(self._relay(websocket, queue))
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
     
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        if websocket in self.subscriptions:
-            del self.subscriptions[websocket]
+        self.active_connections.discard(websocket)
+        for data_type in self.subscriptions.pop(websocket, ()):
+            self._remove_subscriber(data_type, websocket)
+        self.queues.pop(websocket, None)
+        relay_task = self.relay_tasks.pop(websocket, None)
+        if relay_task is not None and relay_task is not asyncio.current_task():
+            relay_task.cancel()
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
     
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        """Send a message to a specific WebSocket connection."""
+    async def _relay(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send a connection's queued messages in order until it fails or disconnects."""
         try:
-            await websocket.send_text(message)
+            while True:
+                message = await queue.get()
+                await websocket.send_text(message)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Error sending personal message: {e}")
+            logger.error(f"Error sending to connection: {e}")
             self.disconnect(websocket)
     
-    async def broadcast(self, message: str):
-        """Broadcast a message to all connected clients."""
-        if not self.active_connections:
+    def _enqueue(self, websocket: WebSocket, message: str):
+        """Queue a message for a connection, dropping the connection if its queue is full."""
+        queue = self.queues.get(websocket)
+        if queue is None:
             return
-        
-        # Create a copy of the list to avoid modification during iteration
-        connections = self.active_connections.copy()
-        
-        for connection in connections:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self._drop_slow_consumer(websocket)
+    
+    def _fan_out(self, connections, message: str):
+        """Queue a message for many connections, dropping slow ones once the loop is done."""
+        # Enqueueing never mutates the collections being iterated, so no snapshot is taken
+        slow = []
+        for websocket in connections:
             try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to connection: {e}")
-                self.disconnect(connection)
+                self.queues[websocket].put_nowait(message)
+            except asyncio.QueueFull:
+                slow.append(websocket)
+        for websocket in slow:
+            self._drop_slow_consumer(websocket)
+    
+    def _drop_slow_consumer(self, websocket: WebSocket):
+        """Disconnect a client whose send queue is full and close its socket."""
+        logger.warning("Dropping slow WebSocket consumer")
+        self.disconnect(websocket)
+        close_task = asyncio.create_task(self._close(websocket, SLOW_CONSUMER_CLOSE_CODE))
+        self.close_tasks.add(close_task)
+        close_task.add_done_callback(self.close_tasks.discard)
+    
+    async def _close(self, websocket: WebSocket, code: int):
+        """Close a connection, ignoring errors from one that is already gone."""
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+    
+    async def send_personal_message(self, message: str, websocket: WebSocket):
+        """Send a message to a specific WebSocket connection."""
+        self._enqueue(websocket, message)
+    
+    async def broadcast(self, message: str):
+        """Broadcast a message to all connected clients."""
+        # Queue to every client; slow ones no longer delay the rest
+        self._fan_out(self.queues, message)
     
     async def broadcast_to_subscribers(self, data_type: str, message: str):
         """Broadcast a message to clients subscribed to a specific data type."""
-        if not self.active_connections:
-            return
-        
-        connections = self.active_connections.copy()
-        
-        for connection in connections:
-            try:
-                # Check if client is subscribed to this data type
-                if connection in self.subscriptions and data_type in self.subscriptions[connection]:
-                    await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to subscriber: {e}")
-                self.disconnect(connection)
+        self._fan_out(self.topic_subs.get(data_type, ()), message)
     
     def subscribe(self, websocket: WebSocket, data_type: str):
         """Subscribe a client to a specific data type."""
         if websocket in self.subscriptions:
             if data_type not in self.subscriptions[websocket]:
                 self.subscriptions[websocket].append(data_type)
+                self.topic_subs.setdefault(data_type, set()).add(websocket)
                 logger.info(f"Client subscribed to {data_type}")
     
     def unsubscribe(self, websocket: WebSocket, data_type: str):
@@ -83,23 +134,76 @@ class ConnectionManager:
         if websocket in self.subscriptions:
             if data_type in self.subscriptions[websocket]:
                 self.subscriptions[websocket].remove(data_type)
+                self._remove_subscriber(data_type, websocket)
                 logger.info(f"Client unsubscribed from {data_type}")
     
+    def _remove_subscriber(self, data_type: str, websocket: WebSocket):
+        """Drop a client from a data type's subscribers, forgetting empty data types."""
+        subscribers = self.topic_subs.get(data_type)
+        if subscribers is not None:
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self.topic_subs[data_type]
+    
     def get_connection_count(self) -> int:
         """Get the number of active connections."""
         return len(self.active_connections)
     
     def get_subscription_stats(self) -> Dict[str, int]:
         """Get subscription statistics."""
-        stats = {}
-        for subscriptions in self.subscriptions.values():
-            for data_type in subscriptions:
-                stats[data_type] = stats.get(data_type, 0) + 1
-        return stats
+        return {data_type: len(subscribers) for data_type, subscribers in self.topic_subs.items()}
 
 # Global connection manager
 manager = ConnectionManager()
 
+def encode_message(message: Dict[str, Any]) -> str:
+    """Serialize a broadcast message once, as text for the clients' JSON.parse."""
+    return orjson.dumps(message, option=MESSAGE_JSON_OPTIONS, default=str).decode()
+
+class OHLCVCoalescer:
+    """Collects per-tick OHLCV updates and broadcasts the latest bar of each symbol in batches."""
+    
+    def __init__(self, interval: float = OHLCV_FLUSH_INTERVAL):
+        self.interval = interval
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.flush_task: Optional[asyncio.Task] = None
+    
+    def add(self, symbol: str, data: Dict[str, Any]):
+        """Record a symbol's latest bar, starting a flush if none is scheduled."""
+        self.pending[symbol] = data
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def _flush_loop(self):
+        """Flush pending bars every interval until no new ticks arrive."""
+        while self.pending:
+            await asyncio.sleep(self.interval)
+            batch, self.pending = self.pending, {}
+            try:
+                await self.flush(batch)
+            except Exception as e:
+                logger.error(f"Error broadcasting OHLCV batch: {e}")
+    
+    async def flush(self, batch: Dict[str, Dict[str, Any]]):
+        """Broadcast a batch of symbol bars to OHLCV subscribers."""
+        message = encode_message({
+            "type": "ohlcv_batch",
+            "data": batch,
+            "timestamp": datetime.now(timezone.utc)
+        })
+        await manager.broadcast_to_subscribers("ohlcv", message)
+        logger.info("Broadcasted OHLCV batch for %d symbols", len(batch))
+    
+    async def stop(self):
+        """Cancel the pending flush, discarding unsent ticks."""
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+        self.pending = {}
+
+# Global OHLCV batcher
+ohlcv_coalescer = OHLCVCoalescer()
+
 async def websocket_endpoint(websocket: WebSocket):
     """
     WebSocket endpoint for real-time data streaming.
@@ -180,35 +284,23 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 async def broadcast_ohlcv_update(symbol: str, data: Dict[str, Any]):
-    """Broadcast OHLCV update to subscribed clients."""
-    from datetime import datetime, timezone
-    
-    message = json.dumps({
-        "type": "ohlcv_update",
-        "symbol": symbol,
-        "data": data,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
-    
-    await manager.broadcast_to_subscribers("ohlcv", message)
-    logger.info(f"Broadcasted OHLCV update for {symbol}")
+    """Queue an OHLCV update for the next batched broadcast to subscribed clients."""
+    ohlcv_coalescer.add(symbol, data)
 
 async def broadcast_news_update(news: Dict[str, Any]):
     """Broadcast news update to subscribed clients."""
-    from datetime import datetime, timezone
-    
-    message = json.dumps({
+    message = encode_message({
         "type": "news_update",
         "data": news,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": datetime.now(timezone.utc)
     })
     
     await manager.broadcast_to_subscribers("news", message)
-    logger.info(f"Broadcasted news update: {news.get('headline', 'Unknown')[:50]}...")
+    logger.info("Broadcasted news update: %.50s...", news.get('headline', 'Unknown'))
 
 async def broadcast_filing_update(symbol: str, filing: Dict[str, Any]):
     """Broadcast filing update to subscribed clients."""
-    message = json.dumps({
+    message = encode_message({
         "type": "filing_update",
         "symbol": symbol,
         "data": filing,
@@ -219,7 +311,7 @@ async def broadcast_filing_update(symbol: str, filing: Dict[str, Any]):
 
 async def broadcast_system_status(status: Dict[str, Any]):
     """Broadcast system status update to all clients."""
-    message = json.dumps({
+    message = encode_message({
         "type": "system_status",
         "data": status,
         "timestamp": "N/A"  # Would be current timestamp
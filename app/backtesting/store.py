@@ -0,0 +1,163 @@
+"""
+SQLite-backed store for backtest status and results.
+Keeps finished results out of process memory and serves listings from an index.
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columns returned for status lookups and listings (results are loaded separately)
+STATUS_COLUMNS = ("backtest_id", "status", "progress", "message", "created_at", "completed_at")
+
+
+class BacktestStore:
+    """Persists backtest status rows and pickled results in SQLite."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._init_database()
+
+    def _init_database(self):
+        """Create the backtests table and its indexes."""
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS backtests (
+                    backtest_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    created_at TEXT NOT NULL,
+                    completed_at TEXT,
+                    results BLOB,
+                    etag TEXT
+                )
+            """)
+            # Databases created before results were tagged lack the etag column
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(backtests)")}
+            if "etag" not in columns:
+                conn.execute("ALTER TABLE backtests ADD COLUMN etag TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_backtests_created ON backtests(created_at DESC)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_backtests_status ON backtests(status, created_at DESC)")
+
+    def create(self, backtest_id: str, status: str, progress: float, message: str, created_at: str):
+        """Insert a new backtest status row."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO backtests (backtest_id, status, progress, message, created_at) VALUES (?, ?, ?, ?, ?)",
+                (backtest_id, status, progress, message, created_at)
+            )
+
+    def update(self, backtest_id: str, results: Optional[Dict[str, Any]] = None, **fields):
+        """
+        Update status fields, and optionally the results, of a backtest.
+
+        Args:
+            backtest_id: Backtest ID
+            results: Backtest results to store (pickled, since they may hold DataFrames,
+                and tagged with a digest of the pickle for HTTP caching)
+            **fields: Status columns to set (status, progress, message, completed_at)
+        """
+        unknown = set(fields) - set(STATUS_COLUMNS[1:])
+        if unknown:
+            raise ValueError(f"Unknown backtest fields: {sorted(unknown)}")
+
+        columns = list(fields)
+        values = [fields[column] for column in columns]
+        if results is not None:
+            blob = pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+            columns.extend(("results", "etag"))
+            values.extend((blob, hashlib.blake2b(blob, digest_size=16).hexdigest()))
+        if not columns:
+            return
+
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(f"UPDATE backtests SET {assignments} WHERE backtest_id = ?", (*values, backtest_id))
+
+    def fail_interrupted(self, message: str, completed_at: str) -> int:
+        """
+        Mark backtests left queued or running by a previous process as failed.
+
+        Their jobs died with that process, so no worker will ever pick them up.
+
+        Args:
+            message: Status message explaining the failure
+            completed_at: Timestamp recorded as the completion time
+
+        Returns:
+            Number of backtests marked as failed
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "UPDATE backtests SET status = 'failed', message = ?, completed_at = ? "
+                "WHERE status IN ('queued', 'running')",
+                (message, completed_at)
+            )
+            return cursor.rowcount
+
+    def get(self, backtest_id: str) -> Optional[Dict[str, Any]]:
+        """Get the status row of a backtest, or None if it does not exist."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(STATUS_COLUMNS)} FROM backtests WHERE backtest_id = ?",
+                (backtest_id,)
+            ).fetchone()
+        return dict(zip(STATUS_COLUMNS, row)) if row else None
+
+    def get_results(self, backtest_id: str) -> Optional[Dict[str, Any]]:
+        """Load the stored results of a backtest, or None if there are none."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT results FROM backtests WHERE backtest_id = ?",
+                (backtest_id,)
+            ).fetchone()
+        if not row or row[0] is None:
+            return None
+        return pickle.loads(row[0])
+
+    def get_etag(self, backtest_id: str) -> Optional[str]:
+        """Get the digest of a backtest's stored results, or None if there are none."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT etag FROM backtests WHERE backtest_id = ?",
+                (backtest_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def list(self, limit: int = 50, offset: int = 0,
+             status: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List backtests newest first.
+
+        Args:
+            limit: Maximum number of backtests to return
+            offset: Number of backtests to skip
+            status: Only include backtests with this status
+
+        Returns:
+            Tuple of (page of status rows, total matching backtests)
+        """
+        where = "WHERE status = ?" if status else ""
+        params: Tuple = (status,) if status else ()
+
+        with sqlite3.connect(self.db_path) as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM backtests {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {', '.join(STATUS_COLUMNS)} FROM backtests {where} "
+                "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+
+        return [dict(zip(STATUS_COLUMNS, row)) for row in rows], total
+
+    def delete(self, backtest_id: str) -> bool:
+        """Delete a backtest, returning True if it existed."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("DELETE FROM backtests WHERE backtest_id = ?", (backtest_id,))
+            return cursor.rowcount > 0
@@ -98,10 +98,68 @@ class VectorizedBacktestEngine:
             )
             results[symbol] = symbol_results
         
-        # Combine results
+        self.logger.info("Backtest completed successfully")
+        return self.combine_symbol_results(
+            results, strategy, symbols, start_date, end_date,
+            initial_balance, commission, slippage
+        )
+    
+    def run_symbol(
+        self,
+        strategy: BaseStrategy,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        initial_balance: float = 100000.0,
+        commission: float = 0.0,
+        slippage: float = 0.001,
+        include_news: bool = True,
+        include_filings: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load data for and backtest a single symbol.
+        
+        Symbols are independent in the vectorized engine, so callers can run
+        them in parallel and merge them with combine_symbol_results.
+        
+        Returns:
+            Per-symbol results, or None if no data was loaded for the symbol
+        """
+        data = self.data_loader.create_unified_dataset(
+            symbols=[symbol],
+            start_date=start_date,
+            end_date=end_date,
+            include_news=include_news,
+            include_filings=include_filings
+        )
+        
+        if symbol not in data:
+            return None
+        
+        self.logger.info(f"Running backtest for {symbol}")
+        return self._run_symbol_backtest(
+            strategy=strategy,
+            symbol=symbol,
+            data=data[symbol],
+            initial_balance=initial_balance,
+            commission=commission,
+            slippage=slippage
+        )
+    
+    def combine_symbol_results(
+        self,
+        results: Dict[str, Any],
+        strategy: BaseStrategy,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        initial_balance: float,
+        commission: float,
+        slippage: float
+    ) -> Dict[str, Any]:
+        """Combine per-symbol results and attach backtest metadata."""
         combined_results = self._combine_results(results, initial_balance)
         
-        # Add metadata
         combined_results['metadata'] = {
             'strategy_name': strategy.name,
             'symbols': symbols,
@@ -114,7 +172,6 @@ class VectorizedBacktestEngine:
             'created_at': datetime.now(timezone.utc).isoformat()
         }
         
-        self.logger.info("Backtest completed successfully")
         return combined_results
     
     def _run_symbol_backtest(
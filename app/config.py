@@ -74,6 +74,11 @@ TRADING_CONFIG = {
 
 # WebSocket Configuration
 WS_URL = f"ws://{API_HOST}:{API_PORT}/stream"
+# Protocol-level keepalive: ping idle sockets every interval, close if no pong within the timeout
+WS_PING_INTERVAL = 30.0  # seconds
+WS_PING_TIMEOUT = 30.0  # seconds
+# Negotiate permessage-deflate so repetitive JSON frames are compressed on the wire
+WS_PER_MESSAGE_DEFLATE = True
 
 # Database Configuration
 DB_CONFIG = {
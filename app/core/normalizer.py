@@ -2,12 +2,25 @@
 Data normalizer for converting raw API responses to canonical schemas.
 Ensures consistent data format across all data sources.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime, timezone
 import logging
+import re
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Keywords for simple headline sentiment scoring
+POSITIVE_WORDS = frozenset(['beat', 'exceed', 'strong', 'growth', 'profit', 'gain', 'rise', 'up', 'positive'])
+NEGATIVE_WORDS = frozenset(['miss', 'fall', 'decline', 'loss', 'weak', 'down', 'negative', 'drop', 'crash'])
+# Single alternation so each text is scanned once instead of once per keyword
+SENTIMENT_PATTERN = re.compile("|".join(sorted(POSITIVE_WORDS | NEGATIVE_WORDS, key=len, reverse=True)))
+
 class DataNormalizer:
     """Normalizes data from various sources to canonical schemas."""
     
@@ -72,6 +85,90 @@ class DataNormalizer:
             logger.error(f"Failed to normalize OHLCV data: {e}")
             return None
     
+    def normalize_ohlcv_batch(self, symbol: str, timestamps: Sequence[float], opens: Sequence[float],
+                              highs: Sequence[float], lows: Sequence[float], closes: Sequence[float],
+                              volumes: Sequence[float], interval: str, source: str) -> List[Dict[str, Any]]:
+        """
+        Normalize parallel OHLCV arrays (e.g. candle responses) to canonical schema in bulk.
+        
+        Args:
+            symbol: Ticker symbol shared by every bar
+            timestamps: Unix timestamps in seconds
+            opens, highs, lows, closes, volumes: Bar values aligned with timestamps
+            interval: Bar interval
+            source: Data source name
+            
+        Returns:
+            List of normalized OHLCV records
+        """
+        try:
+            count = len(timestamps)
+            if not symbol or count == 0:
+                return []
+            if any(len(values) != count for values in (opens, highs, lows, closes, volumes)):
+                logger.warning(f"Mismatched OHLCV array lengths for {symbol}")
+                return []
+            
+            if not NUMPY_AVAILABLE:
+                bars = (
+                    self.normalize_ohlcv({
+                        "symbol": symbol, "timestamp": t, "open": o, "high": h,
+                        "low": l, "close": c, "volume": v, "interval": interval
+                    }, source)
+                    for t, o, h, l, c, v in zip(timestamps, opens, highs, lows, closes, volumes)
+                )
+                return [bar for bar in bars if bar]
+            
+            # Format all timestamps in one vectorized pass; like the per-bar
+            # path, bars with a missing or zero timestamp are dropped
+            ts = np.asarray(timestamps, dtype=np.float64)
+            valid = np.isfinite(ts) & (ts != 0)
+            seconds = ts[valid].astype(np.int64).astype("datetime64[s]")
+            timestamps_utc = np.char.add(np.datetime_as_string(seconds, unit="s"), "+00:00").tolist()
+            
+            columns = [
+                self._nullable_column(values, valid, np.float64)
+                for values in (opens, highs, lows, closes)
+            ]
+            volume = self._nullable_column(volumes, valid, np.int64)
+            recv_ts = datetime.now(timezone.utc).isoformat()
+            
+            return [
+                {
+                    "symbol": symbol,
+                    "exchange": None,
+                    "timestamp_utc": timestamp_utc,
+                    "interval": interval,
+                    "open": open_,
+                    "high": high,
+                    "low": low,
+                    "close": close,
+                    "volume": vol,
+                    "source": source,
+                    "recv_ts": recv_ts
+                }
+                for timestamp_utc, open_, high, low, close, vol in zip(timestamps_utc, *columns, volume)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Failed to normalize OHLCV batch: {e}")
+            return []
+    
+    @staticmethod
+    def _nullable_column(values: Sequence[Any], valid: "np.ndarray", dtype) -> List[Any]:
+        """
+        Convert one OHLCV array to a list, with None where normalize_ohlcv would give None.
+        
+        Missing (null or non-finite) values become None rather than NaN, and so do
+        zeros, which the per-bar path treats as missing too.
+        """
+        array = np.asarray(values, dtype=np.float64)[valid]
+        missing = ~np.isfinite(array) | (array == 0)
+        column = np.where(missing, 0, array).astype(dtype).tolist()
+        for index in np.flatnonzero(missing).tolist():
+            column[index] = None
+        return column
+    
     def normalize_news(self, raw_data: Dict[str, Any], source: str) -> Dict[str, Any]:
         """
         Normalize news data to canonical schema.
@@ -135,14 +232,7 @@ class DataNormalizer:
             summary = self._extract_summary(raw_data)
             
             # Create normalized record
-            normalized = {
-                "symbol": symbol,
-                "filing_type": filing_type,
-                "filing_date": filing_date,
-                "url": url,
-                "summary": summary,
-                "raw_xbrl": raw_data
-            }
+            normalized = self.build_filing(symbol, filing_type, filing_date, url, summary, raw_data)
             
             # Validate required fields
             if not all(normalized.get(field) is not None for field in ["symbol", "filing_type", "filing_date"]):
@@ -155,6 +245,32 @@ class DataNormalizer:
             logger.error(f"Failed to normalize filing data: {e}")
             return None
     
+    def build_filing(self, symbol: str, filing_type: str, filing_date: str,
+                     url: Optional[str] = None, summary: Optional[str] = None,
+                     raw_xbrl: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Build a filing record in canonical schema from already-parsed fields.
+        
+        Args:
+            symbol: Ticker symbol
+            filing_type: Form type such as 10-K
+            filing_date: Filing date as YYYY-MM-DD
+            url: Link to the filing document
+            summary: Short description of the filing
+            raw_xbrl: Source payload kept alongside the record
+            
+        Returns:
+            Filing record
+        """
+        return {
+            "symbol": symbol,
+            "filing_type": filing_type,
+            "filing_date": filing_date,
+            "url": url,
+            "summary": summary,
+            "raw_xbrl": raw_xbrl
+        }
+    
     def _extract_symbol(self, data: Dict[str, Any]) -> Optional[str]:
         """Extract symbol from raw data."""
         return (data.get("symbol") or 
@@ -257,21 +373,21 @@ class DataNormalizer:
             return float(sentiment)
         
         # If no sentiment provided, try to calculate from headline
-        headline = data.get("headline", "")
-        if headline:
-            # Simple sentiment analysis
-            positive_words = ['beat', 'exceed', 'strong', 'growth', 'profit', 'gain', 'rise', 'up', 'positive']
-            negative_words = ['miss', 'fall', 'decline', 'loss', 'weak', 'down', 'negative', 'drop', 'crash']
-            
-            text_lower = headline.lower()
-            positive_count = sum(1 for word in positive_words if word in text_lower)
-            negative_count = sum(1 for word in negative_words if word in text_lower)
-            
-            if positive_count + negative_count > 0:
-                sentiment = (positive_count - negative_count) / (positive_count + negative_count)
-                return max(-1.0, min(1.0, sentiment))  # Clamp between -1 and 1
+        return self.score_sentiment(data.get("headline", ""))
+    
+    def score_sentiment(self, text: str) -> float:
+        """Score text from -1 to 1 by the distinct sentiment keywords it contains."""
+        if not text:
+            return 0.0
+        
+        found = set(SENTIMENT_PATTERN.findall(text.lower()))
+        positive_count = len(found & POSITIVE_WORDS)
+        negative_count = len(found) - positive_count
+        
+        if positive_count + negative_count == 0:
+            return 0.0  # Neutral
         
-        return 0.0
+        return (positive_count - negative_count) / (positive_count + negative_count)
     
     def _extract_filing_type(self, data: Dict[str, Any]) -> Optional[str]:
         """Extract filing type."""
@@ -28,6 +28,8 @@ except ImportError:
         sys.path.append(os.path.dirname(__file__))
         from storage_simple import SimpleStorageManager
 
+from .storage_simple import SENTIMENT_NEUTRAL_BAND
+
 logger = logging.getLogger(__name__)
 
 class StorageManager:
@@ -333,20 +335,27 @@ class StorageManager:
             logger.error(f"Failed to query OHLCV data for {symbol}: {e}")
             return pd.DataFrame() if PANDAS_AVAILABLE else []
     
-    def query_news(self, ticker: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+    def query_news(self, ticker: Optional[str] = None, since: Optional[str] = None,
+                   limit: Optional[int] = None, before: Optional[Tuple[str, str]] = None,
+                   sentiment_min: Optional[float] = None,
+                   sentiment_max: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Query news data.
         
         Args:
             ticker: Filter by ticker symbol
             since: Filter by date (ISO format)
+            limit: Maximum number of records (None for all)
+            before: Only include records older than this (timestamp_utc, id) cursor
+            sentiment_min: Minimum sentiment score
+            sentiment_max: Maximum sentiment score
             
         Returns:
-            List of news records
+            List of news records, newest first
         """
         # Use simple storage if pandas not available
         if not PANDAS_AVAILABLE:
-            return self.simple_storage.query_news(ticker, since)
+            return self.simple_storage.query_news(ticker, since, limit, before, sentiment_min, sentiment_max)
         
         try:
             # Query metadata first
@@ -364,7 +373,25 @@ class StorageManager:
                     query += " AND timestamp_utc >= ?"
                     params.append(since)
                 
-                query += " ORDER BY timestamp_utc DESC"
+                # Missing sentiment scores count as neutral
+                if sentiment_min is not None:
+                    query += " AND COALESCE(sentiment_score, 0.0) >= ?"
+                    params.append(sentiment_min)
+                
+                if sentiment_max is not None:
+                    query += " AND COALESCE(sentiment_score, 0.0) <= ?"
+                    params.append(sentiment_max)
+                
+                # Keyset pagination: continue strictly after the previous page's last record
+                if before is not None:
+                    query += " AND (timestamp_utc, id) < (?, ?)"
+                    params.extend(before)
+                
+                query += " ORDER BY timestamp_utc DESC, id DESC"
+                
+                if limit is not None:
+                    query += " LIMIT ?"
+                    params.append(limit)
                 
                 cursor.execute(query, params)
                 rows = cursor.fetchall()
@@ -392,6 +419,49 @@ class StorageManager:
             logger.error(f"Failed to query news data: {e}")
             return []
     
+    def get_sentiment_stats(self, ticker: Optional[str] = None,
+                            since: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Aggregate news sentiment in SQL without loading the articles.
+        
+        Args:
+            ticker: Filter by ticker symbol
+            since: Filter by date (ISO format)
+            
+        Returns:
+            Average sentiment and positive/negative/neutral/total counts
+        """
+        if not PANDAS_AVAILABLE:
+            return self.simple_storage.get_sentiment_stats(ticker, since)
+        
+        query = """
+            SELECT AVG(COALESCE(sentiment_score, 0.0)),
+                   COALESCE(SUM(CASE WHEN sentiment_score > ? THEN 1 ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN sentiment_score < ? THEN 1 ELSE 0 END), 0),
+                   COUNT(*)
+            FROM news_metadata WHERE 1=1
+        """
+        params = [SENTIMENT_NEUTRAL_BAND, -SENTIMENT_NEUTRAL_BAND]
+        
+        if ticker:
+            query += " AND tickers LIKE ?"
+            params.append(f"%{ticker}%")
+        
+        if since:
+            query += " AND timestamp_utc >= ?"
+            params.append(since)
+        
+        with sqlite3.connect(self.db_path) as conn:
+            average, positive_count, negative_count, total_count = conn.execute(query, params).fetchone()
+        
+        return {
+            "average": average or 0.0,
+            "positive_count": positive_count,
+            "negative_count": negative_count,
+            "neutral_count": total_count - positive_count - negative_count,
+            "total_count": total_count
+        }
+    
     def _update_file_manifest(self, file_path: str, record_count: int, 
                             start_ts: pd.Timestamp, end_ts: pd.Timestamp):
         """Update file manifest in database."""
@@ -477,14 +547,16 @@ class StorageManager:
     
     def query_filings(self, symbol: Optional[str] = None, 
                      filing_type: Optional[str] = None,
-                     since: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Query filing data."""
+                     since: Optional[str] = None,
+                     limit: Optional[int] = None,
+                     before: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
+        """Query filing data, most recent first."""
         if not PANDAS_AVAILABLE:
-            return self.simple_storage.query_filings(symbol, filing_type, since)
+            return self.simple_storage.query_filings(symbol, filing_type, since, limit, before)
         
         # TODO: Implement Parquet query for filings
         logger.warning("Parquet filing query not yet implemented, using simple storage")
-        return self.simple_storage.query_filings(symbol, filing_type, since)
+        return self.simple_storage.query_filings(symbol, filing_type, since, limit, before)
     
     def get_storage_stats(self) -> Dict[str, Any]:
         """Get storage statistics."""
@@ -5,12 +5,31 @@ This avoids pandas/pyarrow compilation issues on Windows.
 import os
 import json
 import gzip
+import hashlib
+import heapq
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sentiment scores within +/- this band count as neutral
+SENTIMENT_NEUTRAL_BAND = 0.1
+
+def record_position(record: Dict[str, Any], field: str,
+                    tie_field: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Get a record's (date, tie) position in newest-first order, as used by keyset cursors.
+    
+    The tie is the record's tie_field as text, so integer and string ids compare
+    alike. Records without one fall back to a hash of the whole record, which is
+    unique for distinct records.
+    """
+    tie = record.get(tie_field) if tie_field else None
+    if tie is None:
+        tie = hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode()).hexdigest()
+    return str(record.get(field) or ''), str(tie)
+
 class SimpleStorageManager:
     """Simplified storage manager using JSON files."""
     
@@ -329,8 +348,24 @@ class SimpleStorageManager:
             logger.error(f"Failed to query OHLCV data for {symbol}: {e}")
             return []
     
-    def query_news(self, ticker: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Query news data."""
+    @staticmethod
+    def _newest_first(records: List[Dict[str, Any]], field: str, tie_field: Optional[str],
+                      limit: Optional[int], before: Optional[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Order records by record_position descending, keeping the page after a cursor."""
+        key = lambda record: record_position(record, field, tie_field)
+        if before is not None:
+            before = tuple(str(value) for value in before)
+            records = [record for record in records if key(record) < before]
+        if limit is None:
+            return sorted(records, key=key, reverse=True)
+        # Partial sort: only the first limit records are ordered
+        return heapq.nlargest(limit, records, key=key)
+    
+    def query_news(self, ticker: Optional[str] = None, since: Optional[str] = None,
+                   limit: Optional[int] = None, before: Optional[Tuple[str, str]] = None,
+                   sentiment_min: Optional[float] = None,
+                   sentiment_max: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Query news data, newest first."""
         try:
             news_path = os.path.join(self.data_path, "news")
             
@@ -376,19 +411,40 @@ class SimpleStorageManager:
                         filtered_news.append(news)
                 all_news = filtered_news
             
-            # Sort by timestamp (newest first)
-            all_news.sort(key=lambda x: x.get('timestamp_utc', ''), reverse=True)
+            # Filter by sentiment if specified (missing scores count as neutral)
+            if sentiment_min is not None:
+                all_news = [news for news in all_news if news.get('sentiment_score', 0.0) >= sentiment_min]
+            if sentiment_max is not None:
+                all_news = [news for news in all_news if news.get('sentiment_score', 0.0) <= sentiment_max]
             
-            return all_news
+            # Sort by timestamp (newest first)
+            return self._newest_first(all_news, 'timestamp_utc', 'id', limit, before)
             
         except Exception as e:
             logger.error(f"Failed to query news data: {e}")
             return []
     
+    def get_sentiment_stats(self, ticker: Optional[str] = None,
+                            since: Optional[str] = None) -> Dict[str, Any]:
+        """Aggregate news sentiment into average and positive/negative/neutral counts."""
+        sentiments = [news.get('sentiment_score', 0.0) for news in self.query_news(ticker, since)]
+        positive_count = sum(1 for score in sentiments if score > SENTIMENT_NEUTRAL_BAND)
+        negative_count = sum(1 for score in sentiments if score < -SENTIMENT_NEUTRAL_BAND)
+        
+        return {
+            "average": sum(sentiments) / len(sentiments) if sentiments else 0.0,
+            "positive_count": positive_count,
+            "negative_count": negative_count,
+            "neutral_count": len(sentiments) - positive_count - negative_count,
+            "total_count": len(sentiments)
+        }
+    
     def query_filings(self, symbol: Optional[str] = None, 
                      filing_type: Optional[str] = None,
-                     since: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Query filing data."""
+                     since: Optional[str] = None,
+                     limit: Optional[int] = None,
+                     before: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
+        """Query filing data, most recent first."""
         try:
             filings_path = os.path.join(self.data_path, "filings")
             
@@ -428,9 +484,8 @@ class SimpleStorageManager:
                 all_filings = filtered_filings
             
             # Sort by filing date (most recent first)
-            all_filings.sort(key=lambda x: x.get('filing_date', ''), reverse=True)
-            
-            return all_filings
+            # Filings have no unique field, so ties on a date break on the record hash
+            return self._newest_first(all_filings, 'filing_date', None, limit, before)
             
         except Exception as e:
             logger.error(f"Failed to query filing data: {e}")
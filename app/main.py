@@ -12,13 +12,19 @@ from typing import Dict, Any
 
 from fastapi import FastAPI, WebSocket
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 import uvicorn
 
-from app.config import API_HOST, API_PORT, LOG_PATH, KEYS_PATH, RATE_LIMITS, DATA_PATH, DB_PATH
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+from app.config import API_HOST, API_PORT, LOG_PATH, KEYS_PATH, RATE_LIMITS, DATA_PATH, DB_PATH, WS_PING_INTERVAL, WS_PING_TIMEOUT, WS_PER_MESSAGE_DEFLATE
 from app.api.routes import router
-from app.api.websocket import websocket_endpoint, manager
-from app.api.key_management import router as key_router, set_vault
+from app.api.websocket import websocket_endpoint, manager, ohlcv_coalescer
+from app.api.key_management import router as key_router, set_vault, close_probe_session
 from app.core.rate_limiter import setup_rate_limiters
 from app.security.vault import setup_vault_interactive
 from app.adapters.finnhub import FinnhubAdapter
@@ -73,6 +79,13 @@ async def lifespan(app: FastAPI):
     storage = StorageManager(DATA_PATH, DB_PATH)
     logger.info("Storage manager initialized")
     
+    # Initialize the trading engine and database
+    setup_trading_state(app)
+    logger.info("Trading engine initialized")
+    
+    # Open the backtest store, failing backtests interrupted by the last shutdown
+    get_backtest_store()
+    
     # Initialize adapters
     await initialize_adapters(vault)
     
@@ -92,6 +105,18 @@ async def lifespan(app: FastAPI):
     # Stop adapters
     await stop_adapters()
     
+    # Stop the trading engine
+    await shutdown_trading_state(app)
+    
+    # Stop backtest worker processes
+    shutdown_backtest_pool()
+    
+    # Close the API key test session
+    await close_probe_session()
+    
+    # Stop batching OHLCV broadcasts
+    await ohlcv_coalescer.stop()
+    
     logger.info("Application shutdown complete")
 
 # Create FastAPI app
@@ -99,7 +124,8 @@ app = FastAPI(
     title="NeuroTradeAI Data Scraper",
     description="Real-time trading data ingestion and query API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Include routers
@@ -107,8 +133,8 @@ app.include_router(router, prefix="/api/v1")
 app.include_router(key_router, prefix="/api/v1")
 
 # Include trading and backtesting routes
-from app.api.trading_routes import router as trading_router
-from app.api.backtest_routes import router as backtest_router
+from app.api.trading_routes import router as trading_router, setup_trading_state, shutdown_trading_state
+from app.api.backtest_routes import router as backtest_router, get_backtest_store, shutdown_backtest_pool
 app.include_router(trading_router, prefix="")
 app.include_router(backtest_router, prefix="")
 
@@ -242,12 +268,20 @@ def main():
     # Start the server
     logger.info(f"Starting server on {API_HOST}:{API_PORT}")
     
+    # Prefer uvloop for cheaper task scheduling (unavailable on Windows)
+    loop = "uvloop" if UVLOOP_AVAILABLE else "asyncio"
+    logger.info(f"Using {loop} event loop")
+    
     uvicorn.run(
         "app.main:app",
         host=API_HOST,
         port=API_PORT,
         reload=False,
-        log_level="info"
+        log_level="info",
+        loop=loop,
+        ws_ping_interval=WS_PING_INTERVAL,
+        ws_ping_timeout=WS_PING_TIMEOUT,
+        ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE
     )
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ Uses Fernet (AES-128) symmetric encryption with user passphrase.
 """
 import os
 import base64
+import copy
 from typing import Dict, Optional, Any
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -21,6 +22,9 @@ class CredentialVault:
         self.vault_path = vault_path
         self._fernet: Optional[Fernet] = None
         self._salt: Optional[bytes] = None
+        # Decrypted credentials and the (mtime_ns, size) of the file they came from
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_stamp: Optional[tuple] = None
         
     def _derive_key(self, password: str, salt: bytes) -> bytes:
         """Derive encryption key from password and salt using PBKDF2."""
@@ -67,8 +71,14 @@ class CredentialVault:
     def lock(self):
         """Lock the vault (clear encryption key from memory)."""
         self._fernet = None
+        self._invalidate_cache()
         logger.info("Vault locked")
     
+    def _invalidate_cache(self):
+        """Drop the decrypted credentials cache."""
+        self._cache = None
+        self._cache_stamp = None
+    
     def is_unlocked(self) -> bool:
         """Check if vault is currently unlocked."""
         return self._fernet is not None
@@ -88,6 +98,7 @@ class CredentialVault:
             
             with open(self.vault_path, 'wb') as f:
                 f.write(encrypted_data)
+            self._invalidate_cache()
             
             logger.info("Credentials stored successfully")
             return True
@@ -104,11 +115,19 @@ class CredentialVault:
             return {}
         
         try:
-            with open(self.vault_path, 'rb') as f:
-                encrypted_data = f.read()
+            # Reuse the last decryption while the vault file is unchanged
+            stat = os.stat(self.vault_path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if self._cache is None or stamp != self._cache_stamp:
+                with open(self.vault_path, 'rb') as f:
+                    encrypted_data = f.read()
+                
+                decrypted_data = self._fernet.decrypt(encrypted_data)
+                self._cache = json.loads(decrypted_data.decode())
+                self._cache_stamp = stamp
             
-            decrypted_data = self._fernet.decrypt(encrypted_data)
-            return json.loads(decrypted_data.decode())
+            # Callers such as set_api_key modify the returned dict
+            return copy.deepcopy(self._cache)
         except Exception as e:
             logger.error(f"Failed to retrieve credentials: {e}")
             return {}
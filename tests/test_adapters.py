@@ -3,10 +3,12 @@ Unit tests for adapter components.
 """
 import pytest
 import asyncio
+from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock, AsyncMock, patch
 from app.adapters.finnhub import FinnhubAdapter
 from app.adapters.news import NewsAdapter
 from app.adapters.edgar import EdgarAdapter
+from app.core.normalizer import normalizer
 
 class TestFinnhubAdapter:
     """Test the FinnhubAdapter class."""
@@ -58,11 +60,13 @@ class TestFinnhubAdapter:
     async def test_stop(self, finnhub_config):
         """Test adapter stop."""
         adapter = FinnhubAdapter("finnhub", finnhub_config)
-        adapter.session = AsyncMock()
+        session = adapter._acquire_session()
+        adapter.session = session
         
         await adapter.stop()
         
-        adapter.session.close.assert_called_once()
+        assert session.closed
+        assert adapter.session is None
     
     def test_normalize_ohlcv(self, finnhub_config):
         """Test OHLCV data normalization."""
@@ -81,7 +85,91 @@ class TestFinnhubAdapter:
         assert normalized["symbol"] == "AAPL"
         assert normalized["close"] == 100.0
         assert normalized["source"] == "finnhub"
-    
+
+    def test_process_historical_data_matches_per_bar_normalization(self):
+        """Test batch candle normalization matches the per-bar path."""
+        adapter = FinnhubAdapter("finnhub", {"api_key": "test_api_key"})
+
+        data = {
+            "s": "ok",
+            "t": [1640995200, 1640995260],
+            "o": [100.0, 101.0],
+            "h": [102.0, 103.5],
+            "l": [99.5, 100.5],
+            "c": [101.0, 103.0],
+            "v": [1500, 2500]
+        }
+
+        bars = adapter._process_historical_data(data, "AAPL", "1")
+
+        assert len(bars) == 2
+        for i, bar in enumerate(bars):
+            expected = adapter.normalize({
+                "symbol": "AAPL", "timestamp": data["t"][i], "open": data["o"][i],
+                "high": data["h"][i], "low": data["l"][i], "close": data["c"][i],
+                "volume": data["v"][i], "interval": "1"
+            })
+            expected.pop("recv_ts")
+            bar.pop("recv_ts")
+            assert bar == expected
+
+    def test_process_historical_data_keeps_missing_values_null(self):
+        """Test null candle fields stay None in the batch path, as in the per-bar path."""
+        adapter = FinnhubAdapter("finnhub", {"api_key": "test_api_key"})
+
+        data = {
+            "s": "ok",
+            "t": [1640995200, 1640995260, None],
+            "o": [None, 101.0, 102.0],
+            "h": [102.0, None, 104.0],
+            "l": [99.5, 100.5, 101.0],
+            "c": [101.0, 103.0, 103.5],
+            "v": [None, 2500, 3000]
+        }
+
+        bars = adapter._process_historical_data(data, "AAPL", "1")
+
+        assert len(bars) == 2
+        for i, bar in enumerate(bars):
+            expected = adapter.normalize({
+                "symbol": "AAPL", "timestamp": data["t"][i], "open": data["o"][i],
+                "high": data["h"][i], "low": data["l"][i], "close": data["c"][i],
+                "volume": data["v"][i], "interval": "1"
+            })
+            expected.pop("recv_ts")
+            bar.pop("recv_ts")
+            assert bar == expected
+        assert bars[0]["open"] is None
+        assert bars[0]["volume"] is None
+        assert bars[1]["high"] is None
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_polls_symbols_concurrently(self):
+        """Test quote polling overlaps requests instead of sleeping between symbols."""
+        adapter = FinnhubAdapter("finnhub", {
+            "api_key": "test_api_key",
+            "watchlist": ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA"]
+        })
+        in_flight = 0
+        peak = 0
+
+        async def fake_fetch(symbol, timestamp):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        adapter._fetch_symbol_quote = AsyncMock(side_effect=fake_fetch)
+
+        await adapter._fetch_data()
+
+        polled = {call.args[0] for call in adapter._fetch_symbol_quote.call_args_list}
+        timestamps = {call.args[1] for call in adapter._fetch_symbol_quote.call_args_list}
+        assert polled == {"AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA"}
+        assert len(timestamps) == 1
+        assert peak == 6
+
     def test_normalize_invalid_data(self, finnhub_config):
         """Test normalization of invalid data."""
         adapter = FinnhubAdapter("finnhub", finnhub_config)
@@ -177,6 +265,86 @@ class TestNewsAdapter:
         assert normalized["source"] == "news"
         assert "sentiment_score" in normalized
 
+    def test_news_sentiment_counts_distinct_keywords(self):
+        """Test keyword sentiment counts each keyword once, as substrings."""
+        assert normalizer.score_sentiment("Strong growth, strong profit") == 1.0
+        assert normalizer.score_sentiment("Shares fall after earnings miss despite upgrade") == -1 / 3
+        assert normalizer.score_sentiment("Company holds annual meeting") == 0.0
+        assert normalizer.score_sentiment("") == 0.0
+
+    @pytest.mark.asyncio
+    async def test_queued_writes_are_batched(self):
+        """Test queued news records are stored in one batch and drained on stop."""
+        adapter = NewsAdapter("news", {"api_key": "test_api_key"})
+        adapter.storage = Mock()
+
+        for i in range(3):
+            adapter._queue_write({"id": f"news_{i}"})
+        await adapter._stop_background_task()
+
+        adapter.storage.store_news.assert_called_once_with(
+            [{"id": "news_0"}, {"id": "news_1"}, {"id": "news_2"}]
+        )
+        assert adapter._write_queue is None
+
+    @pytest.mark.asyncio
+    async def test_handle_data_does_not_wait_for_broadcast(self):
+        """Test ingest returns while a slow WebSocket broadcast is still pending."""
+        adapter = NewsAdapter("news", {"api_key": "test_api_key"})
+        adapter.storage = Mock()
+        release = asyncio.Event()
+        sent = []
+
+        async def slow_broadcast(record):
+            await release.wait()
+            sent.append(record)
+
+        adapter._broadcast = slow_broadcast
+
+        await asyncio.wait_for(adapter._handle_data({"id": "news_1", "headline": "Test"}), timeout=1)
+        assert sent == []
+
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert sent == [{"id": "news_1", "headline": "Test"}]
+
+        await adapter._stop_background_task()
+        adapter.storage.store_news.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_fetch_historical_news_streams_items(self):
+        """Test historical news is parsed item by item from the response stream."""
+        adapter = NewsAdapter("news", {"api_key": "test_api_key"})
+        adapter.session = Mock()
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = asyncio.StreamReader()
+        mock_response.content.feed_data(
+            b'[{"id": 1, "datetime": 1640995200, "headline": "Strong growth", "url": "https://a.example"},'
+            b' {"id": 2, "datetime": 1640995260, "headline": "Shares drop", "url": "https://b.example"}]'
+        )
+        mock_response.content.feed_eof()
+        adapter.session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+        adapter.session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        items = await adapter.fetch_historical_news("AAPL", days_back=7)
+
+        assert [item["headline"] for item in items] == ["Strong growth", "Shares drop"]
+        mock_response.read.assert_not_called()
+
+    def test_company_news_params_reused_within_date_window(self):
+        """Test company news params are cached per symbol until the dates change."""
+        adapter = NewsAdapter("news", {"api_key": "test_api_key"})
+
+        first = adapter._get_company_news_params("AAPL", "2025-01-01", "2025-01-08")
+        assert adapter._get_company_news_params("AAPL", "2025-01-01", "2025-01-08") is first
+
+        moved = adapter._get_company_news_params("AAPL", "2025-01-02", "2025-01-09")
+        assert moved is not first
+        assert moved == {"symbol": "AAPL", "from": "2025-01-02", "to": "2025-01-09", "token": "test_api_key"}
+
 class TestEdgarAdapter:
     """Test the EdgarAdapter class."""
     
@@ -244,3 +412,177 @@ class TestEdgarAdapter:
         result = await adapter.health_check()
         
         assert result is True
+    
+    @pytest.mark.asyncio
+    async def test_fetch_data_checks_symbols_concurrently(self, edgar_config):
+        """Test filing checks are dispatched for every mapped symbol."""
+        adapter = EdgarAdapter("edgar", edgar_config)
+        adapter._semaphore = asyncio.Semaphore(4)
+        adapter._dispatch_lock = asyncio.Lock()
+        adapter._get_cik_numbers = AsyncMock(return_value={"AAPL": "0000320193", "MSFT": "0000789019"})
+        adapter._check_company_filings = AsyncMock()
+        
+        await adapter._fetch_data()
+        
+        checked = {call.args[0] for call in adapter._check_company_filings.call_args_list}
+        assert checked == {"AAPL", "MSFT"}
+        assert adapter.last_check is not None
+    
+    @pytest.mark.asyncio
+    async def test_cik_map_is_cached(self, edgar_config):
+        """Test the ticker to CIK map is fetched once and then reused."""
+        adapter = EdgarAdapter("edgar", edgar_config)
+        adapter.session = Mock()
+        
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {"ETag": '"abc"'}
+        mock_response.content = asyncio.StreamReader()
+        mock_response.content.feed_data(
+            b'{"0": {"ticker": "AAPL", "cik_str": 320193},'
+            b' "1": {"ticker": "IBM", "cik_str": 51143}}'
+        )
+        mock_response.content.feed_eof()
+        adapter.session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+        adapter.session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+        
+        first = await adapter._get_cik_numbers()
+        second = await adapter._get_cik_numbers()
+        
+        assert first == {"AAPL": "0000320193"}
+        assert second is first
+        assert adapter.session.get.call_count == 1
+        assert adapter._cik_etag == '"abc"'
+    
+    def test_iter_recent_filings_uses_cutoff(self, edgar_config):
+        """Test only filings inside the 30-day window are extracted."""
+        adapter = EdgarAdapter("edgar", edgar_config)
+        recent = (datetime.now(timezone.utc) - timedelta(days=5)).strftime('%Y-%m-%d')
+        dei_facts = {
+            "EntityRegistrantName": "Apple Inc.",
+            "10-K": {
+                "units": {
+                    "USD": [
+                        {"end": "2001-09-30", "val": 1},
+                        {"end": recent, "val": 2}
+                    ]
+                }
+            }
+        }
+        
+        filings = list(adapter._iter_recent_filings(dei_facts, "AAPL"))
+        
+        assert len(filings) == 1
+        assert filings[0]["filing_date"] == recent
+        assert filings[0]["filing_type"] == "10-K"
+        assert filings[0]["raw_xbrl"]["entity_name"] == "Apple Inc."
+        assert filings[0]["raw_xbrl"]["source"] == "edgar"
+        assert filings[0]["raw_xbrl"]["fact"] == {"end": recent, "val": 2}
+        assert normalizer.validate_schema(filings[0], "filings")
+    
+    @pytest.mark.asyncio
+    async def test_run_forever_sleeps_for_polling_interval(self, edgar_config):
+        """Test the run loop idles between polls and wakes on stop."""
+        adapter = EdgarAdapter("edgar", edgar_config)
+        adapter._fetch_data = AsyncMock()
+        
+        task = asyncio.create_task(adapter._run_forever())
+        await asyncio.sleep(0.05)
+        
+        assert adapter._fetch_data.await_count == 1
+        assert adapter.polling_interval == 21600
+        
+        adapter._stop_event.set()
+        await asyncio.wait_for(task, timeout=1)
+        assert adapter.is_running is False
+    
+    @pytest.mark.asyncio
+    async def test_handle_filings_stores_batch_once(self, edgar_config, sample_filing_data):
+        """Test a batch of filings is written with a single storage call."""
+        adapter = EdgarAdapter("edgar", edgar_config)
+        adapter.storage = Mock()
+        filings = sample_filing_data * 3
+        
+        with patch('app.api.websocket.broadcast_filing_update', new_callable=AsyncMock) as mock_broadcast:
+            await adapter._handle_filings(filings)
+        
+        adapter.storage.store_filings.assert_called_once_with(filings)
+        assert mock_broadcast.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_fetch_data_checks_known_ciks_without_ticker_map(self, edgar_config):
+        """Test well-known CIKs are checked even if the ticker map is unavailable."""
+        edgar_config["watchlist"] = ["AAPL", "NEWCO"]
+        adapter = EdgarAdapter("edgar", edgar_config)
+        adapter._semaphore = asyncio.Semaphore(4)
+        adapter._dispatch_lock = asyncio.Lock()
+        adapter._get_cik_numbers = AsyncMock(return_value={})
+        adapter._check_company_filings = AsyncMock()
+        
+        await adapter._fetch_data()
+        
+        adapter._check_company_filings.assert_awaited_once()
+        assert adapter._check_company_filings.call_args.args[:2] == ("AAPL", "0000320193")
+    
+    @pytest.mark.asyncio
+    async def test_adapters_share_rest_session(self, edgar_config):
+        """Test adapters with the same headers share one session until the last stops."""
+        first = EdgarAdapter("edgar", edgar_config)
+        second = EdgarAdapter("edgar", edgar_config)
+        
+        session = first._acquire_session()
+        assert second._acquire_session() is session
+        
+        await first._release_session()
+        assert not session.closed
+        
+        await second._release_session()
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_finnhub_and_news_share_rest_session(self):
+        """Test the Finnhub and news adapters poll through one shared session."""
+        finnhub = FinnhubAdapter("finnhub", {"api_key": "key"})
+        news = NewsAdapter("news", {"api_key": "key"})
+
+        session = finnhub._acquire_session()
+        assert news._acquire_session() is session
+
+        await finnhub._release_session()
+        await news._release_session()
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_decode_json_offloads_large_bodies(self, edgar_config):
+        """Test only large response bodies are decoded in the executor."""
+        adapter = EdgarAdapter("edgar", edgar_config)
+        small = b'{"s": "ok"}'
+        large = b'[' + b','.join([b'{"headline": "x"}'] * 5000) + b']'
+
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, "run_in_executor", wraps=loop.run_in_executor) as run_in_executor:
+            assert await adapter._decode_json(small) == {"s": "ok"}
+            run_in_executor.assert_not_called()
+
+            assert len(await adapter._decode_json(large)) == 5000
+            run_in_executor.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_read_dei_facts_streams_only_wanted_fields(self, edgar_config):
+        """Test only the filing-related facts.dei entries are materialized."""
+        adapter = EdgarAdapter("edgar", edgar_config)
+        content = asyncio.StreamReader()
+        content.feed_data(
+            b'{"cik": 320193, "facts": {"dei": {'
+            b'"EntityCommonStockSharesOutstanding": {"units": {"shares": [{"val": 1}]}},'
+            b'"EntityRegistrantName": "Apple Inc.",'
+            b'"10-K": {"units": {"USD": [{"end": "2025-09-30", "val": 2.5}]}}},'
+            b'"us-gaap": {"Revenues": {"units": {"USD": [{"val": 3}]}}}}}'
+        )
+        content.feed_eof()
+        
+        dei_facts = await adapter._read_dei_facts(content)
+        
+        assert set(dei_facts) == {"EntityRegistrantName", "10-K"}
+        assert dei_facts["10-K"]["units"]["USD"][0] == {"end": "2025-09-30", "val": 2.5}
+        assert isinstance(dei_facts["10-K"]["units"]["USD"][0]["val"], float)
@@ -168,7 +168,33 @@ class TestVectorizedBacktestEngine:
         assert 'metadata' in result
         assert 'symbol_results' in result
         assert 'AAPL' in result['symbol_results']
-    
+
+    def test_run_symbol(self):
+        """Test running a single-symbol shard and combining it."""
+        data_loader = Mock()
+        data_loader.create_unified_dataset.return_value = {
+            'AAPL': pd.DataFrame({'close': [100, 101, 102, 101, 100] * 4})
+        }
+
+        strategy = Mock()
+        strategy.name = "test_strategy"
+        strategy.generate_signals.return_value = []
+
+        engine = VectorizedBacktestEngine(data_loader)
+        start_date = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        end_date = datetime(2023, 1, 2, tzinfo=timezone.utc)
+
+        result = engine.run_symbol(strategy, 'AAPL', start_date, end_date)
+        assert result['symbol'] == 'AAPL'
+        assert engine.run_symbol(strategy, 'MSFT', start_date, end_date) is None
+        assert data_loader.create_unified_dataset.call_args.kwargs['symbols'] == ['MSFT']
+
+        combined = engine.combine_symbol_results(
+            {'AAPL': result}, strategy, ['AAPL', 'MSFT'], start_date, end_date, 100000.0, 0.0, 0.001
+        )
+        assert combined['symbols'] == ['AAPL']
+        assert combined['metadata']['symbols'] == ['AAPL', 'MSFT']
+
     def test_calculate_performance_metrics(self):
         """Test performance metrics calculation."""
         data_loader = Mock()
@@ -469,7 +495,19 @@ class TestBacktestAPI:
         assert request.initial_balance == 100000.0
         assert request.commission == 0.0
         assert request.slippage == 0.001
-    
+        assert request.start_date == datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+        # Unknown fields are rejected
+        from pydantic import ValidationError
+        with pytest.raises(ValidationError):
+            BacktestRequest(
+                strategy_name="mean_reversion",
+                symbols=["AAPL"],
+                start_date="2023-01-01T00:00:00Z",
+                end_date="2023-01-02T00:00:00Z",
+                initial_cash=50000.0
+            )
+
     def test_get_strategy(self):
         """Test getting strategy instance."""
         from app.api.backtest_routes import get_strategy
@@ -488,5 +526,68 @@ class TestBacktestAPI:
             get_strategy("unknown_strategy")
 
 
+
+class TestBacktestStore:
+    """Test SQLite-backed backtest storage."""
+    
+    def test_list_orders_filters_and_paginates(self, temp_dir):
+        """Test listing is newest first, filtered by status and paginated."""
+        from app.backtesting.store import BacktestStore
+        
+        store = BacktestStore(os.path.join(temp_dir, "backtests.db"))
+        for i in range(5):
+            store.create(f"bt{i}", status="queued", progress=0.0, message="queued",
+                         created_at=f"2023-01-0{i + 1}T00:00:00+00:00")
+        store.update("bt1", status="completed", progress=100.0)
+        store.update("bt3", status="completed", progress=100.0)
+        
+        page, total = store.list(limit=2, offset=1)
+        assert total == 5
+        assert [bt["backtest_id"] for bt in page] == ["bt3", "bt2"]
+        
+        completed, total = store.list(status="completed")
+        assert total == 2
+        assert [bt["backtest_id"] for bt in completed] == ["bt3", "bt1"]
+    
+    def test_results_round_trip(self, temp_dir):
+        """Test results, including DataFrames, are stored and loaded back."""
+        from app.backtesting.store import BacktestStore
+        
+        store = BacktestStore(os.path.join(temp_dir, "backtests.db"))
+        store.create("bt", status="running", progress=10.0, message="Running",
+                     created_at="2023-01-01T00:00:00+00:00")
+        assert store.get_results("bt") is None
+        assert store.get_etag("bt") is None
+        
+        portfolio = pd.DataFrame({"total_value": [100000.0, 100500.0]})
+        store.update("bt", results={"symbol_results": {"AAPL": {"portfolio": portfolio}}},
+                     status="completed", progress=100.0)
+        
+        assert store.get("bt")["status"] == "completed"
+        assert store.get_etag("bt") is not None
+        loaded = store.get_results("bt")
+        pd.testing.assert_frame_equal(loaded["symbol_results"]["AAPL"]["portfolio"], portfolio)
+        
+        assert store.delete("bt") is True
+        assert store.get("bt") is None
+    
+    def test_fail_interrupted_marks_active_backtests(self, temp_dir):
+        """Test backtests left queued or running by a previous process are failed."""
+        from app.backtesting.store import BacktestStore
+        
+        store = BacktestStore(os.path.join(temp_dir, "backtests.db"))
+        for backtest_id, status in (("q", "queued"), ("r", "running"), ("c", "completed")):
+            store.create(backtest_id, status=status, progress=0.0, message=status,
+                         created_at="2023-01-01T00:00:00+00:00")
+        
+        restarted = BacktestStore(os.path.join(temp_dir, "backtests.db"))
+        assert restarted.fail_interrupted("Backtest interrupted by restart", "2023-01-02T00:00:00+00:00") == 2
+        
+        assert restarted.get("q")["status"] == "failed"
+        assert restarted.get("r")["message"] == "Backtest interrupted by restart"
+        assert restarted.get("r")["completed_at"] == "2023-01-02T00:00:00+00:00"
+        assert restarted.get("c")["status"] == "completed"
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
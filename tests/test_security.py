@@ -172,6 +172,28 @@ class TestCredentialSecurity:
         for service, expected_key in keys.items():
             assert vault.get_key(service) == expected_key
 
+    def test_vault_credentials_cache(self, temp_dir):
+        """Test decrypted credentials are reused until the vault file changes."""
+        vault_path = os.path.join(temp_dir, "test_vault.enc")
+        vault = CredentialVault(vault_path)
+        assert vault.unlock("test_password")
+        vault.set_api_key("finnhub", "key1")
+
+        # Mutating a returned dict must not leak into later reads
+        vault.get_credentials()["finnhub"]["api_key"] = "tampered"
+        with patch.object(vault._fernet, "decrypt", wraps=vault._fernet.decrypt) as decrypt:
+            assert vault.get_api_key("finnhub") == "key1"
+            assert vault.get_api_key("finnhub") == "key1"
+            assert decrypt.call_count == 0
+
+        # Writes invalidate the cache
+        vault.set_api_key("finnhub", "key2")
+        assert vault.get_api_key("finnhub") == "key2"
+
+        # Locking drops the decrypted credentials
+        vault.lock()
+        assert vault._cache is None
+
 class TestDataValidation:
     """Test data validation and sanitization."""
     
@@ -5,7 +5,7 @@ import pytest
 import json
 import os
 from datetime import datetime, timezone
-from app.core.storage_simple import SimpleStorageManager
+from app.core.storage_simple import SimpleStorageManager, record_position
 
 class TestSimpleStorageManager:
     """Test the SimpleStorageManager class."""
@@ -100,7 +100,59 @@ class TestSimpleStorageManager:
         # Test non-existent filters
         empty_filings = test_storage.query_filings(symbol="NONEXISTENT")
         assert len(empty_filings) == 0
-    
+
+    def test_query_news_pagination_and_sentiment(self, test_storage):
+        """Test news queries page newest first and filter by sentiment."""
+        test_storage.store_news([
+            {
+                "id": f"news_{day}",
+                "timestamp_utc": f"2025-10-{day:02d}T12:00:00Z",
+                "tickers": ["AAPL"],
+                "sentiment_score": 0.2 * (day - 3)
+            }
+            for day in range(1, 6)
+        ])
+
+        first_page = test_storage.query_news(limit=2)
+        assert [news["id"] for news in first_page] == ["news_5", "news_4"]
+        last = first_page[-1]
+        page = test_storage.query_news(limit=2, before=(last["timestamp_utc"], last["id"]))
+        assert [news["id"] for news in page] == ["news_3", "news_2"]
+
+        positive = test_storage.query_news(sentiment_min=0.1)
+        assert [news["id"] for news in positive] == ["news_5", "news_4"]
+
+        negative = test_storage.query_news(sentiment_max=-0.1, limit=1)
+        assert [news["id"] for news in negative] == ["news_2"]
+
+        stats = test_storage.get_sentiment_stats(ticker="AAPL")
+        assert stats["total_count"] == 5
+        assert (stats["positive_count"], stats["negative_count"], stats["neutral_count"]) == (2, 2, 1)
+        assert stats["average"] == pytest.approx(0.0)
+
+    def test_keyset_pages_records_sharing_a_timestamp(self, test_storage):
+        """Test cursors page through records with equal dates and integer or missing ids."""
+        test_storage.store_news([
+            {"id": news_id, "timestamp_utc": "2025-10-01T12:00:00Z", "tickers": ["AAPL"]}
+            for news_id in (7, 8, 9, 10)
+        ])
+        test_storage.store_filings([
+            {"symbol": symbol, "filing_type": "8-K", "filing_date": "2025-10-01", "url": None}
+            for symbol in ("AAPL", "MSFT", "GOOGL", "AMZN")
+        ])
+
+        for query, field, tie_field, key in (
+            (test_storage.query_news, "timestamp_utc", "id", "id"),
+            (test_storage.query_filings, "filing_date", None, "symbol")
+        ):
+            seen = []
+            page = query(limit=3)
+            while page:
+                seen.extend(record[key] for record in page)
+                page = query(limit=3, before=record_position(page[-1], field, tie_field))
+            assert len(seen) == 4
+            assert len(set(seen)) == 4
+
     def test_get_storage_stats(self, test_storage, sample_ohlcv_data, sample_news_data, sample_filing_data):
         """Test getting storage statistics."""
         # Store test data